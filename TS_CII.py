@@ -8,85 +8,80 @@ Interface PyQt6 pour remplir un template de termsheet CII et générer un fichie
 import sys
 import os
 import re
-import pandas as pd
+import importlib.util
+import io
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QFormLayout, QLineEdit, QTextEdit, QCheckBox, QLabel, QPushButton,
-    QFileDialog, QMessageBox, QScrollArea, QGroupBox, QSpinBox,
-    QComboBox, QFrame, QDoubleSpinBox, QDateEdit, QDialog  # <- Ajouter QDialog
+    QFormLayout, QLineEdit, QTextEdit, QLabel, QPushButton,
+    QFileDialog, QMessageBox, QScrollArea, QGroupBox,
+    QComboBox, QDoubleSpinBox, QDialog  # <- Ajouter QDialog
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QDate
-from PyQt6.QtGui import QFont, QPixmap
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QIcon
 
-try:
-    from docx import Document
-    from docx.shared import Inches
-    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-except ImportError:
-    print("Erreur: Le module python-docx n'est pas installé.")
-    print("Installez-le avec: pip install python-docx")
-    sys.exit(1)
+from profils import read_profiles, write_profiles, write_profiles_xlsx
+
+# python-docx est importé à la génération pour ne pas ralentir le démarrage
+if TYPE_CHECKING:
+    from docx.document import Document
+
+
+# Tables de mots, lues directement par NumberToWords sans passer par la classe
+_UNITS = ('', 'un', 'deux', 'trois', 'quatre', 'cinq', 'six', 'sept', 'huit', 'neuf')
+_TEENS = ('dix', 'onze', 'douze', 'treize', 'quatorze', 'quinze', 'seize', 
+          'dix-sept', 'dix-huit', 'dix-neuf')
+_TENS = ('', '', 'vingt', 'trente', 'quarante', 'cinquante', 'soixante', 
+         'soixante-dix', 'quatre-vingt', 'quatre-vingt-dix')
+
+# Échelles de la plus grande à la plus petite : (diviseur, pour un, pluriel)
+_SCALES = (
+    (1000000000, "un milliard", "milliards"),
+    (1000000, "un million", "millions"),
+    (1000, "mille", "mille"),
+)
 
 
 class NumberToWords:
     """Convertit les nombres en lettres (français)"""
     
-    UNITS = ['', 'un', 'deux', 'trois', 'quatre', 'cinq', 'six', 'sept', 'huit', 'neuf']
-    TEENS = ['dix', 'onze', 'douze', 'treize', 'quatorze', 'quinze', 'seize', 
-             'dix-sept', 'dix-huit', 'dix-neuf']
-    TENS = ['', '', 'vingt', 'trente', 'quarante', 'cinquante', 'soixante', 
-            'soixante-dix', 'quatre-vingt', 'quatre-vingt-dix']
+    UNITS = _UNITS
+    TEENS = _TEENS
+    TENS = _TENS
+    SCALES = _SCALES
     
-    @classmethod
-    def convert(cls, number: int) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)  # Mêmes montants convertis à l'aperçu puis à la génération
+    def convert(number: int) -> str:
         """Convertit un nombre en lettres"""
         if number == 0:
             return "zéro"
         
-        if number < 0:
-            return "moins " + cls.convert(-number)
-        
         result = []
         
-        # Milliards
-        if number >= 1000000000:
-            billions = number // 1000000000
-            if billions == 1:
-                result.append("un milliard")
-            else:
-                result.append(cls._convert_hundreds(billions) + " milliards")
-            number %= 1000000000
-        
-        # Millions
-        if number >= 1000000:
-            millions = number // 1000000
-            if millions == 1:
-                result.append("un million")
-            else:
-                result.append(cls._convert_hundreds(millions) + " millions")
-            number %= 1000000
-        
-        # Milliers
-        if number >= 1000:
-            thousands = number // 1000
-            if thousands == 1:
-                result.append("mille")
-            else:
-                result.append(cls._convert_hundreds(thousands) + " mille")
-            number %= 1000
+        if number < 0:
+            result.append("moins")
+            number = -number
+        
+        # Milliards, millions puis milliers
+        convert_hundreds = NumberToWords._convert_hundreds
+        for divisor, one, plural in _SCALES:
+            if number >= divisor:
+                count, number = divmod(number, divisor)
+                result.append(one if count == 1 else convert_hundreds(count) + " " + plural)
         
         # Centaines
         if number > 0:
-            result.append(cls._convert_hundreds(number))
+            result.append(convert_hundreds(number))
         
         return " ".join(result)
     
-    @classmethod
-    def _convert_hundreds(cls, number: int) -> str:
+    @staticmethod
+    def _convert_hundreds(number: int) -> str:
         """Convertit un nombre de 0 à 999 en lettres"""
         result = []
         
@@ -96,7 +91,7 @@ class NumberToWords:
             if hundreds == 1:
                 result.append("cent")
             else:
-                result.append(cls.UNITS[hundreds] + " cent")
+                result.append(_UNITS[hundreds] + " cent")
             number %= 100
         
         # Dizaines et unités
@@ -107,40 +102,61 @@ class NumberToWords:
                 if units == 1:
                     result.append("soixante et onze")
                 elif units > 1:
-                    result.append("soixante-" + cls.TEENS[units - 10])
+                    result.append("soixante-" + _TEENS[units - 10])
                 else:
                     result.append("soixante-dix")
             elif tens == 9:
                 if units > 0:
-                    result.append("quatre-vingt-" + cls.TEENS[units - 10])
+                    result.append("quatre-vingt-" + _TEENS[units - 10])
                 else:
                     result.append("quatre-vingt-dix")
             else:
-                tens_word = cls.TENS[tens]
+                tens_word = _TENS[tens]
                 if units == 1 and tens != 8:
                     result.append(tens_word + " et un")
                 elif units > 0:
-                    result.append(tens_word + "-" + cls.UNITS[units])
+                    result.append(tens_word + "-" + _UNITS[units])
                 else:
                     if tens == 8:
                         result.append("quatre-vingts")
                     else:
                         result.append(tens_word)
         elif number >= 10:
-            result.append(cls.TEENS[number - 10])
+            result.append(_TEENS[number - 10])
         elif number > 0:
-            result.append(cls.UNITS[number])
+            result.append(_UNITS[number])
         
         return " ".join(result)
     
 
+# Séparateurs ignorés dans la saisie d'un montant
+_STRIP = str.maketrans('', '', ' ,.')
+
+
+def _to_int(number: str) -> Optional[int]:
+    """Lit un montant saisi avec séparateurs, None s'il n'est pas numérique"""
+    try:
+        return int(number.translate(_STRIP))
+    except ValueError:
+        return None
+
+
 def format_number_with_dots(number: str) -> str:
     """Formatte un nombre sous forme 1.000.000"""
-    try:
-        n = int(number.replace(" ", "").replace(",", "").replace(".", ""))
-        return f"{n:,}".replace(",", ".")
-    except:
+    n = _to_int(number)
+    if n is None:
         return number
+    return f"{n:_}".replace("_", ".")
+
+
+# Ouverture d'un dossier selon l'OS, choisie une seule fois
+if sys.platform == "win32":
+    _OPEN_FOLDER = os.startfile
+elif sys.platform == "darwin":  # macOS
+    _OPEN_FOLDER = lambda path: os.system(f"open '{path}'")
+else:  # Linux
+    _OPEN_FOLDER = lambda path: os.system(f"xdg-open '{path}'")
+
 
 class ProfileDialog(QDialog):
     """Boîte de dialogue pour créer/modifier un profil"""
@@ -198,12 +214,51 @@ class ProfileDialog(QDialog):
 class TermsheetCIIGenerator(QMainWindow):
     """Application principale pour générer les termsheets CII"""
     
+    # Variables du template et clé de la valeur correspondante
+    _PLACEHOLDER_MAP = {
+        '[Nom du promoteur]': 'nom_promoteur',
+        '[nom]': 'nom_contact',
+        '[Adresse du promoteur]': 'adresse_promoteur',
+        '[date]': 'date',
+        '[réference dossier]': 'reference_dossier',
+        '[Monsieur/Madame/Messieurs]': 'civilite',
+        '[NOM]': 'nom_sccv',
+        '[n° siren]': 'numero_siren',
+        '[Ville]': 'ville_rcs',
+        '[objet]': 'objet',
+        '[section_complete_cii]': 'section_complete_cii',
+        '[nombre_comission_forfaitaire]': 'commission_forfaitaire',
+        '[nombre_comission_forfaitaire_lettres]': 'commission_forfaitaire_lettres',
+        '[taux_commission_risque]': 'taux_commission_risque',
+        '[nombre_frais_acte]': 'frais_acte',
+        '[nombre_frais_acte_lettres]': 'frais_acte_lettres',
+        '[nombre_commission_retainer]': 'commission_retainer',
+        '[nombre_commission_retainer_lettres]': 'commission_retainer_lettres',
+        '[date_validite_accord]': 'date_validite_accord',
+    }
+    # Une seule regex pour toutes les variables, les plus longues d'abord
+    _PLACEHOLDER_RE = re.compile('|'.join(
+        re.escape(k) for k in sorted(_PLACEHOLDER_MAP, key=len, reverse=True)
+    ))
 
     def __init__(self):
         super().__init__()
         self.template_path = None
-        self.profiles_path = Path("profils.xlsx")
+        self._template_bytes = None  # Contenu du template lu une seule fois
+        self._cii_cache = {}  # Montant saisi -> (entier, formaté, en lettres)
+        self._last_dir = ""  # Dernier dossier utilisé dans les boîtes de fichiers
+        self._values_cache = None  # Dernier résultat de get_all_values
+        self._values_dirty = True  # Passe à True dès qu'une saisie change
+        self.profiles_path = Path("profils.json")
+        self.legacy_profiles_path = Path("profils.xlsx")
+        self._profiles = None  # Profils lus une seule fois puis gardés en mémoire
+        self._profiles_error = None  # Erreur du dernier chargement : les profils ne sont alors jamais réécrits
         self.setup_ui()                    # D'ABORD créer l'interface
+        # Profils et template chargés au premier tour de boucle, après le premier affichage
+        QTimer.singleShot(0, self._deferred_init)
+    
+    def _deferred_init(self):
+        """Chargements lancés au premier tour de boucle, une fois la fenêtre affichée"""
         self.load_profiles()              # ENSUITE charger les profils (maintenant que profil_combo existe)
         self.load_default_template()      # ENFIN charger le template
     
@@ -212,6 +267,12 @@ class TermsheetCIIGenerator(QMainWindow):
         default_template = "template_cii.docx"
         
         if os.path.exists(default_template):
+            try:
+                self.read_template(default_template)
+            except OSError as e:
+                QMessageBox.critical(self, "Erreur", f"Impossible de lire le template :\n{e}")
+                self.template_label.setText("Template par défaut illisible - Veuillez importer un template")
+                return
             self.template_path = default_template
             self.template_label.setText(f"Template: {default_template}")
             self.generate_button.setEnabled(True)
@@ -221,59 +282,102 @@ class TermsheetCIIGenerator(QMainWindow):
             self.generate_button.setEnabled(False)
             self.preview_button.setEnabled(False)
 
+    def read_template(self, path: str):
+        """Lit le template en mémoire : chaque génération repart de ces octets sans relire le disque"""
+        with open(path, 'rb') as f:
+            self._template_bytes = f.read()
+
 
 
     def load_profiles(self):
-        """Charge les profils depuis le fichier Excel"""
-        try:
-            if self.profiles_path.exists():
-                df = pd.read_excel(self.profiles_path)
-                
-                # Vérifier que les colonnes existent
-                required_columns = ['Nom du promoteur', 'Nom du contact', 'Adresse du promoteur', 'Civilité']
-                if all(col in df.columns for col in required_columns):
-                    # Ajouter les profils au combo
-                    for promoteur in df['Nom du promoteur'].dropna():
-                        self.profil_combo.addItem(str(promoteur))
+        """Charge les profils depuis le fichier JSON"""
+        if self._profiles is None:
+            try:
+                if self.profiles_path.exists() or self.legacy_profiles_path.exists():
+                    # profils.json, ou reprise unique des profils de l'ancien fichier Excel
+                    self._profiles = read_profiles(self.profiles_path, self.legacy_profiles_path)
                 else:
-                    print("Le fichier Excel ne contient pas les bonnes colonnes")
-            else:
-                # Créer le fichier Excel avec les en-têtes
-                self.create_empty_profiles_file()
-                
-        except Exception as e:
-            print(f"Erreur lors du chargement des profils : {e}")
-    
+                    # Créer le fichier de profils vide
+                    self.create_empty_profiles_file()
+                self._profiles_error = None
+            except Exception as e:
+                # Les profils restent non chargés : save_profile refusera d'écraser le fichier
+                self._profiles_error = e
+                QMessageBox.critical(
+                    self, "Erreur",
+                    f"Erreur lors du chargement des profils : {e}\n\n"
+                    "Aucun profil ne sera enregistré tant que le fichier n'est pas corrigé."
+                )
+                return
+        
+        # Ajouter les profils au combo
+        for profile in self._profiles:
+            if profile.get('nom_promoteur'):
+                self.profil_combo.addItem(profile['nom_promoteur'])
+
     def create_empty_profiles_file(self):
-        """Crée un fichier Excel vide avec les en-têtes"""
+        """Crée un fichier de profils vide"""
+        self._profiles = []
         try:
-            df = pd.DataFrame(columns=['Nom du promoteur', 'Nom du contact', 'Adresse du promoteur', 'Civilité'])
-            df.to_excel(self.profiles_path, index=False)
+            write_profiles(self.profiles_path, self._profiles)
         except Exception as e:
             print(f"Erreur lors de la création du fichier profils : {e}")
-    
+
+    def profiles_unavailable(self) -> bool:
+        """Prévient l'utilisateur si les profils n'ont pas pu être chargés"""
+        if self._profiles is not None:
+            return False
+        QMessageBox.critical(
+            self, "Erreur",
+            f"Les profils n'ont pas pu être chargés ({self._profiles_error}).\n"
+            "Opération annulée pour ne pas écraser les profils existants."
+        )
+        return True
+
+    def export_profiles_xlsx(self):
+        """Exporte les profils vers un fichier Excel"""
+        if self.profiles_unavailable():
+            return
+        
+        output_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Exporter les profils",
+            str(self.legacy_profiles_path),
+            "Fichiers Excel (*.xlsx);;Tous les fichiers (*)"
+        )
+        
+        if not output_path:
+            return
+        
+        try:
+            write_profiles_xlsx(output_path, self._profiles)
+            QMessageBox.information(self, "Succès", "Profils exportés avec succès !")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'export des profils : {e}")
+
     def on_profil_selected(self, profil_name):
         """Méthode appelée quand un profil est sélectionné"""
         if profil_name == "-- Sélectionner un profil --" or not profil_name:
             return
             
         try:
-            if self.profiles_path.exists():
-                df = pd.read_excel(self.profiles_path)
-                
-                # Trouver la ligne correspondant au profil
-                profil_row = df[df['Nom du promoteur'] == profil_name]
+            # Trouver le profil correspondant
+            profile = next(
+                (p for p in self._profiles or [] if p.get('nom_promoteur') == profil_name),
+                None
+            )
+            
+            if profile is not None:
+                # Remplir les champs
+                self.fields['nom_promoteur'].setText(profile['nom_promoteur'])
+                self.fields['nom_contact'].setText(profile['nom_contact'])
+                self.fields['adresse_promoteur'].setText(profile['adresse_promoteur'])
                 
-                if not profil_row.empty:
-                    # Remplir les champs
-                    self.fields['nom_promoteur'].setText(str(profil_row.iloc[0]['Nom du promoteur']))
-                    self.fields['nom_contact'].setText(str(profil_row.iloc[0]['Nom du contact']))
-                    self.fields['adresse_promoteur'].setText(str(profil_row.iloc[0]['Adresse du promoteur']))
-                    
-                    # Sélectionner la civilité dans le combo
-                    civilite = str(profil_row.iloc[0]['Civilité'])
-                    if civilite in ['Monsieur', 'Madame', 'Messieurs']:
-                        self.civilite_combo.setCurrentText(civilite)
+                # Sélectionner la civilité dans le combo
+                civilite = profile['civilite']
+                if civilite in ['Monsieur', 'Madame', 'Messieurs']:
+                    self.civilite_combo.setCurrentText(civilite)
                         
         except Exception as e:
             QMessageBox.warning(self, "Erreur", f"Erreur lors du chargement du profil : {e}")
@@ -283,50 +387,40 @@ class TermsheetCIIGenerator(QMainWindow):
         dialog = ProfileDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             profile_data = dialog.get_profile_data()
-            self.save_profile_to_excel(profile_data)
-            
-            # Rafraîchir la liste des profils
-            self.profil_combo.clear()
-            self.profil_combo.addItem("-- Sélectionner un profil --")
-            self.load_profiles()
-            
-            # Sélectionner le nouveau profil
-            self.profil_combo.setCurrentText(profile_data['nom_promoteur'])
+            if self.save_profile(profile_data):
+                # Rafraîchir la liste des profils
+                self.profil_combo.clear()
+                self.profil_combo.addItem("-- Sélectionner un profil --")
+                self.load_profiles()
+                
+                # Sélectionner le nouveau profil
+                self.profil_combo.setCurrentText(profile_data['nom_promoteur'])
     
-    def save_profile_to_excel(self, profile_data):
-        """Sauvegarde un profil dans le fichier Excel"""
+    def save_profile(self, profile_data) -> bool:
+        """Sauvegarde un profil dans le fichier JSON, retourne True en cas de succès"""
+        if self.profiles_unavailable():
+            return False
+        
         try:
-            # Charger le fichier existant ou créer un nouveau DataFrame
-            if self.profiles_path.exists():
-                df = pd.read_excel(self.profiles_path)
-            else:
-                df = pd.DataFrame(columns=['Nom du promoteur', 'Nom du contact', 'Adresse du promoteur', 'Civilité'])
+            profiles = list(self._profiles)
             
-            # Vérifier si le profil existe déjà
-            if profile_data['nom_promoteur'] in df['Nom du promoteur'].values:
-                # Mettre à jour
-                df.loc[df['Nom du promoteur'] == profile_data['nom_promoteur']] = [
-                    profile_data['nom_promoteur'],
-                    profile_data['nom_contact'],
-                    profile_data['adresse_promoteur'],
-                    profile_data['civilite']
-                ]
+            # Mettre à jour le profil s'il existe déjà, sinon l'ajouter
+            for i, profile in enumerate(profiles):
+                if profile.get('nom_promoteur') == profile_data['nom_promoteur']:
+                    profiles[i] = dict(profile_data)
+                    break
             else:
-                # Ajouter nouvelle ligne
-                new_row = pd.DataFrame([{
-                    'Nom du promoteur': profile_data['nom_promoteur'],
-                    'Nom du contact': profile_data['nom_contact'],
-                    'Adresse du promoteur': profile_data['adresse_promoteur'],
-                    'Civilité': profile_data['civilite']
-                }])
-                df = pd.concat([df, new_row], ignore_index=True)
+                profiles.append(dict(profile_data))
             
-            # Sauvegarder
-            df.to_excel(self.profiles_path, index=False)
+            # Sauvegarder puis mettre à jour la liste en mémoire
+            write_profiles(self.profiles_path, profiles)
+            self._profiles = profiles
             QMessageBox.information(self, "Succès", "Profil sauvegardé avec succès !")
+            return True
             
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur lors de la sauvegarde : {e}")
+            return False
     
     def check_and_propose_save_profile(self):
         """Vérifie si un profil doit être proposé à la sauvegarde"""
@@ -356,12 +450,11 @@ class TermsheetCIIGenerator(QMainWindow):
                         'adresse_promoteur': adresse_promoteur,
                         'civilite': civilite
                     }
-                    self.save_profile_to_excel(profile_data)
-                    
-                    # Rafraîchir la liste
-                    self.profil_combo.clear()
-                    self.profil_combo.addItem("-- Sélectionner un profil --")
-                    self.load_profiles()
+                    if self.save_profile(profile_data):
+                        # Rafraîchir la liste
+                        self.profil_combo.clear()
+                        self.profil_combo.addItem("-- Sélectionner un profil --")
+                        self.load_profiles()
 
 
     def setup_ui(self):
@@ -393,9 +486,14 @@ class TermsheetCIIGenerator(QMainWindow):
         self.nouveau_profil_button = QPushButton("Nouveau Profil")
         self.nouveau_profil_button.clicked.connect(self.create_new_profile)
         
+        # Bouton pour exporter les profils au format Excel
+        self.export_profils_button = QPushButton("Exporter (.xlsx)")
+        self.export_profils_button.clicked.connect(self.export_profiles_xlsx)
+        
         profils_layout.addWidget(QLabel("Profil :"))
         profils_layout.addWidget(self.profil_combo)
         profils_layout.addWidget(self.nouveau_profil_button)
+        profils_layout.addWidget(self.export_profils_button)
         profils_layout.addStretch()
         
         profils_group.setLayout(profils_layout)
@@ -549,6 +647,20 @@ class TermsheetCIIGenerator(QMainWindow):
         
         main_layout.addWidget(scroll)
         main_widget.setLayout(main_layout)
+        
+        # Toute saisie invalide les valeurs mises en cache par get_all_values
+        for widget in self.fields.values():
+            widget.textChanged.connect(self._invalidate_values)
+        self.civilite_combo.currentIndexChanged.connect(self._invalidate_values)
+        self.objet_text.textChanged.connect(self._invalidate_values)
+        for widget in (self.commission_forfaitaire, self.frais_acte,
+                       self.commission_retainer, self.date_validite_accord):
+            widget.textChanged.connect(self._invalidate_values)
+        self.taux_commission_risque.valueChanged.connect(self._invalidate_values)
+    
+    def _invalidate_values(self, *args):
+        """Force le recalcul des valeurs au prochain get_all_values"""
+        self._values_dirty = True
     
     def add_cii(self):
         """Ajoute une nouvelle CII"""
@@ -587,6 +699,10 @@ class TermsheetCIIGenerator(QMainWindow):
         
         cii_widget.setLayout(cii_form_layout)
         
+        # Toute modification de la CII invalide les valeurs en cache
+        for field in cii_fields.values():
+            field.textChanged.connect(self._invalidate_values)
+        
         # Stocker le widget et ses champs
         self.cii_widgets.append({
             'widget': cii_widget,
@@ -598,6 +714,7 @@ class TermsheetCIIGenerator(QMainWindow):
         
         # Mettre à jour l'état du bouton supprimer
         self.remove_cii_button.setEnabled(len(self.cii_widgets) > 1)
+        self._invalidate_values()
     
     def remove_cii(self):
         """Supprime la dernière CII"""
@@ -606,31 +723,39 @@ class TermsheetCIIGenerator(QMainWindow):
             last_cii = self.cii_widgets.pop()
             last_cii['widget'].setParent(None)
             last_cii['widget'].deleteLater()
+            self._invalidate_values()
             
             # Mettre à jour l'état du bouton supprimer
+            # (seule la dernière CII est retirée : les titres restants sont déjà justes)
             self.remove_cii_button.setEnabled(len(self.cii_widgets) > 1)
-            
-            # Mettre à jour les titres des CII restantes
-            for i, cii_data in enumerate(self.cii_widgets):
-                cii_data['widget'].setTitle(f"CII #{i + 1}")
     
     def import_template(self):
         """Importe un template Word"""
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Sélectionner le template Word",
-            "",
+            self._last_dir,
             "Fichiers Word (*.docx);;Tous les fichiers (*)"
         )
         
         if file_path:
+            try:
+                self.read_template(file_path)
+            except OSError as e:
+                QMessageBox.critical(self, "Erreur", f"Impossible de lire le template :\n{e}")
+                return
             self.template_path = file_path
+            self._last_dir = str(Path(file_path).parent)
             self.template_label.setText(f"Template: {Path(file_path).name}")
             self.generate_button.setEnabled(True)
             self.preview_button.setEnabled(True)
     
     def get_all_values(self) -> Dict[str, str]:
         """Récupère toutes les valeurs saisies"""
+        # Rien n'a changé depuis le dernier appel (aperçu puis génération)
+        if not self._values_dirty:
+            return self._values_cache
+        
         values = {}
         
         # Champs principaux
@@ -657,23 +782,14 @@ class TermsheetCIIGenerator(QMainWindow):
         # Taux
         values['taux_commission_risque'] = f"{self.taux_commission_risque.value():.2f}".replace('.', ',')
         
-        # Convertir les montants en lettres
-        try:
-            if values['commission_forfaitaire']:
-                montant = int(values['commission_forfaitaire'].replace(' ', '').replace('.', '').replace(',', ''))
-                values['commission_forfaitaire_lettres'] = NumberToWords.convert(montant)
-            
-            if values['frais_acte']:
-                montant = int(values['frais_acte'].replace(' ', '').replace('.', '').replace(',', ''))
-                values['frais_acte_lettres'] = NumberToWords.convert(montant)
-            
-            if values['commission_retainer']:
-                montant = int(values['commission_retainer'].replace(' ', '').replace('.', '').replace(',', ''))
-                values['commission_retainer_lettres'] = NumberToWords.convert(montant)
-                
-        except ValueError:
-            pass  # Ignorer les erreurs de conversion
+        # Convertir les montants en lettres (montants vides ou invalides ignorés)
+        for key in ('commission_forfaitaire', 'frais_acte', 'commission_retainer'):
+            montant = _to_int(values[key])
+            if montant is not None:
+                values[f'{key}_lettres'] = NumberToWords.convert(montant)
         
+        self._values_cache = values
+        self._values_dirty = False
         return values
     
     def generate_cii_section(self) -> str:
@@ -695,40 +811,40 @@ class TermsheetCIIGenerator(QMainWindow):
             if not beneficiaires or not montant_str or not date_echeance:
                 continue  # Ignorer les CII incomplètes
             
-            # Formater le montant
-            montant_formate = format_number_with_dots(montant_str)
-            
-            # Convertir en lettres
-            try:
-                montant_int = int(montant_str.replace(' ', '').replace(',', '').replace('.', ''))
-                montant_lettres = NumberToWords.convert(montant_int)
-            except ValueError:
-                montant_lettres = ""
+            # Montant formaté et en lettres
+            _, montant_formate, montant_lettres = self._compute_cii(montant_str)
             
-            # Construire le texte de la CII
-            cii_text = "Caution d'indemnité d'immobilisation (CII) :\n\n"
+            # Construire le texte de la CII par morceaux, assemblés une seule fois
+            frag = ["Caution d'indemnité d'immobilisation (CII) :\n\n"]
             
             # Point a. Nature avec bénéficiaires
-            nature_text = f"a. Caution d'indemnité d'immobilisation (CII), émise en faveur de {beneficiaires}"
+            frag.append(f"a. Caution d'indemnité d'immobilisation (CII), émise en faveur de {beneficiaires}")
             if venant_au_droit:
-                nature_text += f", venant au droit de {venant_au_droit}"
-            nature_text += ".\n\n"
-            
-            cii_text += nature_text
+                frag.append(f", venant au droit de {venant_au_droit}")
+            frag.append(".\n\n")
             
             # Point b. Montant
-            cii_text += f"b. Montant : {montant_formate} €"
+            frag.append(f"b. Montant : {montant_formate} €")
             if montant_lettres:
-                cii_text += f" ({montant_lettres} euros)"
-            cii_text += ".\n\n"
+                frag.append(f" ({montant_lettres} euros)")
+            frag.append(".\n\n")
             
             # Point c. Date d'échéance
-            cii_text += f"c. Date d'échéance : {date_echeance}.\n\n"
+            frag.append(f"c. Date d'échéance : {date_echeance}.\n\n")
             
-            cii_sections.append(cii_text)
+            cii_sections.append(''.join(frag))
         
         return "\n".join(cii_sections)
     
+    def _compute_cii(self, montant: str) -> tuple:
+        """Retourne (entier, formaté, en lettres) pour le montant d'une CII, calculés une seule fois"""
+        cached = self._cii_cache.get(montant)
+        if cached is None:
+            montant_int = _to_int(montant)
+            montant_lettres = NumberToWords.convert(montant_int) if montant_int is not None else ""
+            cached = self._cii_cache[montant] = (montant_int, format_number_with_dots(montant), montant_lettres)
+        return cached
+    
     def preview_termsheet(self):
         """Affiche un aperçu des valeurs qui seront remplacées"""
         if not self.template_path:
@@ -737,18 +853,20 @@ class TermsheetCIIGenerator(QMainWindow):
         
         values = self.get_all_values()
         
-        # Créer le texte d'aperçu
-        preview_text = "=== APERÇU DES VALEURS CII ===\n\n"
+        # Créer le texte d'aperçu dans un tampon, lu une seule fois à la fin
+        buf = io.StringIO()
+        w = buf.write
+        w("=== APERÇU DES VALEURS CII ===\n\n")
         
-        preview_text += "INFORMATIONS GÉNÉRALES:\n"
+        w("INFORMATIONS GÉNÉRALES:\n")
         for key in ['nom_promoteur', 'nom_contact', 'adresse_promoteur', 'date', 'reference_dossier', 'civilite', 'nom_sccv', 'numero_siren', 'ville_rcs']:
             if values.get(key):
-                preview_text += f"[{key.upper()}] = {values[key]}\n"
+                w(f"[{key.upper()}] = {values[key]}\n")
         
-        preview_text += f"\nOBJET:\n{values.get('objet', '')}\n"
+        w(f"\nOBJET:\n{values.get('objet', '')}\n")
         
-        preview_text += "\nCAUTIONS D'INDEMNITÉ D'IMMOBILISATION:\n"
-        preview_text += f"Nombre de CII: {len(self.cii_widgets)}\n"
+        w("\nCAUTIONS D'INDEMNITÉ D'IMMOBILISATION:\n")
+        w(f"Nombre de CII: {len(self.cii_widgets)}\n")
         
         for i, cii_data in enumerate(self.cii_widgets):
             fields = cii_data['fields']
@@ -757,39 +875,37 @@ class TermsheetCIIGenerator(QMainWindow):
             montant = fields['montant'].text().strip()
             date_echeance = fields['date_echeance'].text().strip()
             
-            preview_text += f"\nCII #{i+1}:\n"
+            w(f"\nCII #{i+1}:\n")
             if beneficiaires:
-                preview_text += f"  - Bénéficiaires: {beneficiaires}\n"
+                w(f"  - Bénéficiaires: {beneficiaires}\n")
             if venant_au_droit:
-                preview_text += f"  - Venant au droit de: {venant_au_droit}\n"
+                w(f"  - Venant au droit de: {venant_au_droit}\n")
             if montant:
-                montant_formate = format_number_with_dots(montant)
-                try:
-                    montant_int = int(montant.replace(' ', '').replace(',', '').replace('.', ''))
-                    montant_lettres = NumberToWords.convert(montant_int)
-                    preview_text += f"  - Montant: {montant_formate} € ({montant_lettres} euros)\n"
-                except:
-                    preview_text += f"  - Montant: {montant_formate} €\n"
+                montant_int, montant_formate, montant_lettres = self._compute_cii(montant)
+                if montant_int is not None:
+                    w(f"  - Montant: {montant_formate} € ({montant_lettres} euros)\n")
+                else:
+                    w(f"  - Montant: {montant_formate} €\n")
             if date_echeance:
-                preview_text += f"  - Date d'échéance: {date_echeance}\n"
+                w(f"  - Date d'échéance: {date_echeance}\n")
         
-        preview_text += "\nCONDITIONS DE RÉMUNÉRATION:\n"
+        w("\nCONDITIONS DE RÉMUNÉRATION:\n")
         if values.get('commission_forfaitaire'):
-            preview_text += f"Commission forfaitaire: {values['commission_forfaitaire']} € ({values.get('commission_forfaitaire_lettres', '')})\n"
-        preview_text += f"Taux commission de risque: {values.get('taux_commission_risque', '')}%\n"
+            w(f"Commission forfaitaire: {values['commission_forfaitaire']} € ({values.get('commission_forfaitaire_lettres', '')})\n")
+        w(f"Taux commission de risque: {values.get('taux_commission_risque', '')}%\n")
         if values.get('frais_acte'):
-            preview_text += f"Frais d'acte: {values['frais_acte']} € ({values.get('frais_acte_lettres', '')})\n"
+            w(f"Frais d'acte: {values['frais_acte']} € ({values.get('frais_acte_lettres', '')})\n")
         
-        preview_text += "\nMODALITÉS:\n"
+        w("\nMODALITÉS:\n")
         if values.get('commission_retainer'):
-            preview_text += f"Commission de retainer: {values['commission_retainer']} € ({values.get('commission_retainer_lettres', '')})\n"
+            w(f"Commission de retainer: {values['commission_retainer']} € ({values.get('commission_retainer_lettres', '')})\n")
         if values.get('date_validite_accord'):
-            preview_text += f"Date de validité: {values['date_validite_accord']}\n"
+            w(f"Date de validité: {values['date_validite_accord']}\n")
         
         # Afficher dans une boîte de dialogue
         msg = QMessageBox()
         msg.setWindowTitle("Aperçu du Termsheet CII")
-        msg.setText(preview_text)
+        msg.setText(buf.getvalue())
         msg.setStandardButtons(QMessageBox.StandardButton.Ok)
         msg.exec()
     
@@ -799,11 +915,21 @@ class TermsheetCIIGenerator(QMainWindow):
             QMessageBox.warning(self, "Erreur", "Veuillez d'abord importer un template.")
             return
         
+        try:
+            from docx import Document
+        except ImportError:
+            QMessageBox.critical(
+                self,
+                "Erreur",
+                "Le module python-docx n'est pas installé.\nInstallez-le avec : pip install python-docx"
+            )
+            return
+        
         self.check_and_propose_save_profile()
         
         try:
-            # Charger le document template
-            doc = Document(self.template_path)
+            # Charger le document depuis le template déjà en mémoire
+            doc = Document(io.BytesIO(self._template_bytes))
             
             # Récupérer toutes les valeurs
             values = self.get_all_values()
@@ -811,9 +937,12 @@ class TermsheetCIIGenerator(QMainWindow):
             # Remplacer les variables dans le document
             self.replace_variables_in_document(doc, values)
             
-            # Sauvegarder le fichier généré
+            # Sauvegarder le fichier généré : archive construite en mémoire puis écrite en une fois
             output_path = self.get_output_path()
-            doc.save(output_path)
+            buffer = io.BytesIO()
+            doc.save(buffer)
+            with open(output_path, 'wb') as f:
+                f.write(buffer.getbuffer())
             
             # Message de succès
             reply = QMessageBox.question(
@@ -824,79 +953,69 @@ class TermsheetCIIGenerator(QMainWindow):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                # Ouvrir le dossier selon l'OS
-                import platform
-                if platform.system() == "Windows":
-                    os.startfile(Path(output_path).parent)
-                elif platform.system() == "Darwin":  # macOS
-                    os.system(f"open '{Path(output_path).parent}'")
-                else:  # Linux
-                    os.system(f"xdg-open '{Path(output_path).parent}'")
+                _OPEN_FOLDER(Path(output_path).parent)
         
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur lors de la génération:\n{str(e)}")
     
-    def replace_variables_in_document(self, doc: Document, values: Dict[str, str]):
+    def replace_variables_in_document(self, doc: "Document", values: Dict[str, str]):
         """Remplace toutes les variables [VAR] dans le document"""
-        # Remplacer dans les paragraphes
-        for paragraph in doc.paragraphs:
-            self.replace_in_paragraph(paragraph, values)
-        
-        # Remplacer dans les tableaux
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        self.replace_in_paragraph(paragraph, values)
-        
-        # Remplacer dans les en-têtes et pieds de page
-        for section in doc.sections:
-            if section.header:
-                for paragraph in section.header.paragraphs:
-                    self.replace_in_paragraph(paragraph, values)
-            if section.footer:
-                for paragraph in section.footer.paragraphs:
-                    self.replace_in_paragraph(paragraph, values)
+        from docx.opc.constants import RELATIONSHIP_TYPE as RT
+        from docx.oxml.ns import qn
+        from docx.text.paragraph import Paragraph
+        
+        # Valeur de chaque variable, calculée une seule fois pour tout le document
+        replacements = {
+            placeholder: values.get(key, '')
+            for placeholder, key in self._PLACEHOLDER_MAP.items()
+        }
+        
+        # Corps du document (tableaux compris) puis en-têtes et pieds de page
+        roots = [doc.element.body]
+        roots.extend(
+            rel.target_part.element for rel in doc.part.rels.values()
+            if rel.reltype in (RT.HEADER, RT.FOOTER)
+        )
+        
+        # Parcours direct des <w:p> : seuls les paragraphes contenant une variable sont enveloppés
+        w_p, w_t = qn('w:p'), qn('w:t')
+        for root in roots:
+            for p in list(root.iter(w_p)):
+                if '[' in ''.join(t.text or '' for t in p.iter(w_t)):
+                    self.replace_in_paragraph(Paragraph(p, None), replacements)
     
-    def replace_in_paragraph(self, paragraph, values: Dict[str, str]):
+    def replace_in_paragraph(self, paragraph, replacements: Dict[str, str]):
         """Remplace les variables dans un paragraphe en préservant le formatage"""
         original_text = paragraph.text
         
-        # Mapping des variables vers les valeurs
-        replacements = {
-            '[Nom du promoteur]': values.get('nom_promoteur', ''),
-            '[nom]': values.get('nom_contact', ''),
-            '[Adresse du promoteur]': values.get('adresse_promoteur', ''),
-            '[date]': values.get('date', ''),
-            '[réference dossier]': values.get('reference_dossier', ''),
-            '[Monsieur/Madame/Messieurs]': values.get('civilite', ''),
-            '[NOM]': values.get('nom_sccv', ''),
-            '[n° siren]': values.get('numero_siren', ''),
-            '[Ville]': values.get('ville_rcs', ''),
-            '[objet]': values.get('objet', ''),
-            '[section_complete_cii]': values.get('section_complete_cii', ''),
-            '[nombre_comission_forfaitaire]': values.get('commission_forfaitaire', ''),
-            '[nombre_comission_forfaitaire_lettres]': values.get('commission_forfaitaire_lettres', ''),
-            '[taux_commission_risque]': values.get('taux_commission_risque', ''),
-            '[nombre_frais_acte]': values.get('frais_acte', ''),
-            '[nombre_frais_acte_lettres]': values.get('frais_acte_lettres', ''),
-            '[nombre_commission_retainer]': values.get('commission_retainer', ''),
-            '[nombre_commission_retainer_lettres]': values.get('commission_retainer_lettres', ''),
-            '[date_validite_accord]': values.get('date_validite_accord', ''),
-        }
+        # La plupart des paragraphes ne contiennent aucune variable
+        if '[' not in original_text:
+            return
         
-        # Effectuer les remplacements
-        new_text = original_text
-        for old_text, replacement in replacements.items():
-            if old_text in new_text:
-                new_text = new_text.replace(old_text, replacement)
+        # Effectuer les remplacements en une seule passe
+        repl = lambda m: replacements[m.group(0)]
+        new_text = self._PLACEHOLDER_RE.sub(repl, original_text)
         
         # Mettre à jour le paragraphe si il y a eu des changements
         if new_text != original_text:
-            # Conserver le formatage du premier run
-            if paragraph.runs:
+            runs = paragraph.runs
+            run_texts = [run.text for run in runs]
+            new_run_texts = [
+                self._PLACEHOLDER_RE.sub(repl, text) if '[' in text else text
+                for text in run_texts
+            ]
+            
+            # Cas courant : chaque variable tient dans un seul run, réécrit sur place
+            # sans toucher aux autres runs ni à leur mise en forme
+            if runs and ''.join(new_run_texts) == new_text:
+                for run, text, new_run_text in zip(runs, run_texts, new_run_texts):
+                    if new_run_text != text:
+                        run.text = new_run_text
+            
+            # Variable coupée entre plusieurs runs : conserver le formatage du premier run
+            elif runs:
                 # Sauvegarder le style du premier run
-                first_run = paragraph.runs[0]
+                first_run = runs[0]
                 font_name = first_run.font.name
                 font_size = first_run.font.size
                 font_bold = first_run.font.bold
@@ -928,136 +1047,176 @@ class TermsheetCIIGenerator(QMainWindow):
         output_path, _ = QFileDialog.getSaveFileName(
             self,
             "Sauvegarder le termsheet CII généré",
-            output_name,
+            os.path.join(self._last_dir, output_name),
             "Fichiers Word (*.docx);;Tous les fichiers (*)"
         )
         
         if not output_path:
             # Si l'utilisateur annule, sauvegarder dans le dossier courant
             output_path = f"./{output_name}"
+        else:
+            self._last_dir = str(Path(output_path).parent)
         
         return output_path
 
 
+def _minify_qss(qss: str) -> str:
+    """Retire commentaires et espaces superflus d'une feuille de style Qt"""
+    qss = re.sub(r'/\*.*?\*/', '', qss, flags=re.S)
+    return re.sub(r'\s*([{}:;,>])\s*', r'\1', re.sub(r'\s+', ' ', qss)).strip()
+
+
+# Thème LCL, minifié une seule fois à l'import (moins de jetons pour le parseur Qt)
+# Base appliquée à toute l'application
+_LCL_BASE_QSS = _minify_qss("""
+    QMainWindow {
+        background-color: white;
+        color: #333333;
+    }
+    QWidget {
+        background-color: white;
+        color: #333333;
+    }
+""")
+
+# Règles propres aux contrôles de la fenêtre principale
+_LCL_QSS = _minify_qss("""
+    QGroupBox {
+        color: #00468E;
+        font-size: 12px;
+        border: 2px solid #00468E;
+        border-radius: 5px;
+        margin-top: 1ex;
+        padding-top: 10px;
+        background-color: white;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+        color: #00468E;
+    }
+    QPushButton {
+        background-color: #00468E;
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+        font-size: 11px;
+    }
+    QPushButton:hover {
+        background-color: #003a75;
+    }
+    QPushButton:pressed {
+        background-color: #002d5c;
+    }
+    QPushButton:disabled {
+        background-color: #cccccc;
+        color: #666666;
+    }
+    QLineEdit, QTextEdit, QSpinBox, QComboBox, QDoubleSpinBox {
+        border: 2px solid #cccccc;
+        border-radius: 3px;
+        padding: 5px;
+        background-color: white;
+        color: #333333;
+    }
+    QLineEdit:focus, QTextEdit:focus, QSpinBox:focus, QComboBox:focus, QDoubleSpinBox:focus {
+        border: 2px solid #00468E;
+    }
+    QLabel {
+        color: #333333;
+        background-color: transparent;
+    }
+    QCheckBox {
+        spacing: 5px;
+        color: #333333;
+        background-color: transparent;
+    }
+    QCheckBox::indicator {
+        width: 18px;
+        height: 18px;
+    }
+    QCheckBox::indicator:unchecked {
+        border: 2px solid #cccccc;
+        background-color: white;
+        border-radius: 3px;
+    }
+    QCheckBox::indicator:checked {
+        border: 2px solid #00468E;
+        background-color: #00468E;
+        border-radius: 3px;
+    }
+    QScrollArea {
+        border: none;
+        background-color: white;
+    }
+    QScrollArea > QWidget > QWidget {
+        background-color: white;
+    }
+    QFrame[frameShape="4"] {
+        color: #cccccc;
+    }
+""")
+
+
 def main():
     """Fonction principale"""
-    # Vérifier que les dépendances sont installées
-    try:
-        import docx
-    except ImportError:
-        print("ERREUR: Le module python-docx n'est pas installé.")
-        print("Veuillez l'installer avec la commande :")
-        print("pip install python-docx")
-        print("\nPuis relancez le programme.")
-        input("Appuyez sur Entrée pour fermer...")
+    # Vérifier que les dépendances sont installées (sans importer python-docx)
+    if importlib.util.find_spec("docx") is None:
+        sys.stderr.write(
+            "ERREUR: Le module python-docx n'est pas installé.\n"
+            "Veuillez l'installer avec la commande :\n"
+            "pip install python-docx\n"
+            "\nPuis relancez le programme.\n"
+        )
+        # Pas d'attente sans terminal (script de build, CI) : input() bloquerait indéfiniment
+        if sys.stdin and sys.stdin.isatty():
+            input("Appuyez sur Entrée pour fermer...")
         return
     
+    # Attribut à poser avant la création de QApplication : un seul contexte OpenGL partagé
+    # (les pixmaps haute résolution et le bouton d'aide sont déjà gérés par défaut en Qt 6)
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    # Couleurs entièrement fixées par le thème LCL : inutile de lire le thème du bureau
+    QApplication.setDesktopSettingsAware(False)
+    
     app = QApplication(sys.argv)
     app.setApplicationName("Générateur de Termsheet CII - LCL")
     
-    # Définir l'icône de l'application si disponible
-    try:
-        app.setWindowIcon(QPixmap("icon.png"))  # Optionnel
-    except:
-        pass
+    # Police en gras une fois pour toute l'application plutôt qu'un font-weight par sélecteur
+    font = app.font()
+    font.setBold(True)
+    app.setFont(font)
     
-    # Style de l'application - Thème LCL
-    app.setStyleSheet("""
-        QMainWindow {
-            background-color: white;
-            color: #333333;
-        }
-        QWidget {
-            background-color: white;
-            color: #333333;
-        }
-        QGroupBox {
-            font-weight: bold;
-            color: #00468E;
-            font-size: 12px;
-            border: 2px solid #00468E;
-            border-radius: 5px;
-            margin-top: 1ex;
-            padding-top: 10px;
-            background-color: white;
-        }
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            left: 10px;
-            padding: 0 5px 0 5px;
-            color: #00468E;
-            font-weight: bold;
-        }
-        QPushButton {
-            background-color: #00468E;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 4px;
-            font-weight: bold;
-            font-size: 11px;
-        }
-        QPushButton:hover {
-            background-color: #003a75;
-        }
-        QPushButton:pressed {
-            background-color: #002d5c;
-        }
-        QPushButton:disabled {
-            background-color: #cccccc;
-            color: #666666;
-        }
-        QLineEdit, QTextEdit, QSpinBox, QComboBox, QDoubleSpinBox {
-            border: 2px solid #cccccc;
-            border-radius: 3px;
-            padding: 5px;
-            background-color: white;
-            color: #333333;
-            font-weight: bold;
-        }
-        QLineEdit:focus, QTextEdit:focus, QSpinBox:focus, QComboBox:focus, QDoubleSpinBox:focus {
-            border: 2px solid #00468E;
-        }
-        QLabel {
-            color: #333333;
-            font-weight: bold;
-            background-color: transparent;
-        }
-        QCheckBox {
-            spacing: 5px;
-            color: #333333;
-            font-weight: bold;
-            background-color: transparent;
-        }
-        QCheckBox::indicator {
-            width: 18px;
-            height: 18px;
-        }
-        QCheckBox::indicator:unchecked {
-            border: 2px solid #cccccc;
-            background-color: white;
-            border-radius: 3px;
-        }
-        QCheckBox::indicator:checked {
-            border: 2px solid #00468E;
-            background-color: #00468E;
-            border-radius: 3px;
-        }
-        QScrollArea {
-            border: none;
-            background-color: white;
-        }
-        QScrollArea > QWidget > QWidget {
-            background-color: white;
-        }
-        QFrame[frameShape="4"] {
-            color: #cccccc;
-        }
-    """)
+    # Définir l'icône de l'application si disponible (optionnelle, à côté de l'exécutable une fois figé,
+    # sinon à côté du script : PyInstaller place le script dans _internal/, loin de l'exécutable)
+    # Le SVG d'abord : QIcon ne le rastérise qu'aux tailles demandées, au lieu de décoder le PNG au démarrage
+    if getattr(sys, "frozen", False):
+        app_dir = Path(sys.executable).parent
+    else:
+        app_dir = Path(__file__).resolve().parent
+    for icon_name in ("icon.svg", "icon.png"):
+        icon_path = app_dir / icon_name
+        if icon_path.exists():
+            app.setWindowIcon(QIcon(str(icon_path)))
+            break
+    
+    # Style de base de l'application - Thème LCL
+    app.setStyleSheet(_LCL_BASE_QSS)
+    
+    # Pas d'animations de combo, menus ni info-bulles : chaque image repasserait par le moteur de style
+    for effect in (Qt.UIEffect.UI_AnimateCombo, Qt.UIEffect.UI_AnimateMenu, Qt.UIEffect.UI_FadeMenu,
+                   Qt.UIEffect.UI_AnimateTooltip, Qt.UIEffect.UI_FadeTooltip):
+        app.setEffectEnabled(effect, False)
     
     window = TermsheetCIIGenerator()
     window.show()
     
+    # Règles propres aux contrôles : limitées à la fenêtre principale et à ses enfants,
+    # appliquées au tour de boucle suivant pour ne pas retarder le premier affichage
+    QTimer.singleShot(0, lambda: window.setStyleSheet(_LCL_QSS))
+    
     sys.exit(app.exec())
 
 
@@ -8,11 +8,14 @@ Interface PyQt6 pour remplir un template de termsheet et générer un fichier Wo
 import sys
 import os
 import re
-import pandas as pd
+import importlib.util
 from PyQt6.QtWidgets import QDialog  # Ajouter QDialog aux imports existants
+from collections import defaultdict
+from copy import deepcopy
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -21,37 +24,43 @@ from PyQt6.QtWidgets import (
     QComboBox, QFrame, QDoubleSpinBox, QDialog  # <- Ajouter QDialog ici
 )
 
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QObject, QRunnable, QThreadPool
 from PyQt6.QtGui import QFont, QPixmap
 
-try:
-    from docx import Document
-    from docx.shared import Inches
-    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-except ImportError:
-    print("Erreur: Le module python-docx n'est pas installé.")
-    print("Installez-le avec: pip install python-docx")
-    sys.exit(1)
+from profils import read_profiles, write_profiles, write_profiles_xlsx
+
+# python-docx est importé à la génération pour ne pas ralentir le démarrage
+if TYPE_CHECKING:
+    from docx.document import Document
 
 
 class NumberToWords:
     """Convertit les nombres en lettres (français)"""
     
+    __slots__ = ()  # Aucun état d'instance : tout passe par les méthodes statiques
+    
     UNITS = ['', 'un', 'deux', 'trois', 'quatre', 'cinq', 'six', 'sept', 'huit', 'neuf']
     TEENS = ['dix', 'onze', 'douze', 'treize', 'quatorze', 'quinze', 'seize', 
              'dix-sept', 'dix-huit', 'dix-neuf']
     TENS = ['', '', 'vingt', 'trente', 'quarante', 'cinquante', 'soixante', 
             'soixante-dix', 'quatre-vingt', 'quatre-vingt-dix']
+    _BELOW_100: tuple = ()  # Rempli après la définition de la classe
     
-    @classmethod
-    def convert(cls, number: int) -> str:
-        """Convertit un nombre en lettres"""
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def convert(number: int) -> str:
+        """Convertit un nombre en lettres (résultat mis en cache)"""
+        cls = NumberToWords
         if number == 0:
             return "zéro"
         
         if number < 0:
             return "moins " + cls.convert(-number)
         
+        # Cas courant (nombres de lots, petits montants) : pas de milliers
+        if number < 1000:
+            return cls._convert_hundreds(number)
+        
         result = []
         
         # Milliards
@@ -87,9 +96,11 @@ class NumberToWords:
         
         return " ".join(result)
     
-    @classmethod
-    def _convert_hundreds(cls, number: int) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _convert_hundreds(number: int) -> str:
         """Convertit un nombre de 0 à 999 en lettres"""
+        cls = NumberToWords
         result = []
         
         # Centaines
@@ -101,59 +112,136 @@ class NumberToWords:
                 result.append(cls.UNITS[hundreds] + " cent")
             number %= 100
         
-        # Dizaines et unités
+        # Dizaines et unités (table précalculée)
+        if number > 0:
+            result.append(cls._BELOW_100[number])
+        
+        return " ".join(result)
+    
+    @classmethod
+    def _convert_below_100(cls, number: int) -> str:
+        """Convertit un nombre de 0 à 99 en lettres (sert à construire _BELOW_100)"""
         if number >= 20:
             tens = number // 10
             units = number % 10
             if tens == 7:
                 if units == 1:
-                    result.append("soixante et onze")
+                    return "soixante et onze"
                 elif units > 1:
-                    result.append("soixante-" + cls.TEENS[units - 10])
+                    return "soixante-" + cls.TEENS[units - 10]
                 else:
-                    result.append("soixante-dix")
+                    return "soixante-dix"
             elif tens == 9:
                 if units > 0:
-                    result.append("quatre-vingt-" + cls.TEENS[units - 10])
+                    return "quatre-vingt-" + cls.TEENS[units - 10]
                 else:
-                    result.append("quatre-vingt-dix")
+                    return "quatre-vingt-dix"
             else:
                 tens_word = cls.TENS[tens]
                 if units == 1 and tens != 8:
-                    result.append(tens_word + " et un")
+                    return tens_word + " et un"
                 elif units > 0:
-                    result.append(tens_word + "-" + cls.UNITS[units])
+                    return tens_word + "-" + cls.UNITS[units]
+                elif tens == 8:
+                    return "quatre-vingts"
                 else:
-                    if tens == 8:
-                        result.append("quatre-vingts")
-                    else:
-                        result.append(tens_word)
+                    return tens_word
         elif number >= 10:
-            result.append(cls.TEENS[number - 10])
-        elif number > 0:
-            result.append(cls.UNITS[number])
-        
-        return " ".join(result)
-    
+            return cls.TEENS[number - 10]
+        else:
+            return cls.UNITS[number]
+
+
+# Mots de 0 à 99 calculés une fois pour toutes
+NumberToWords._BELOW_100 = tuple(NumberToWords._convert_below_100(n) for n in range(100))
+
+# Pré-remplit le cache des centaines : chaque conversion devient une simple lecture
+for _n in range(1000):
+    NumberToWords._convert_hundreds(_n)
+del _n
+
+
+# Caractères ignorés dans la saisie d'un montant (espaces et virgules)
+_CLEAN = str.maketrans('', '', ' ,')
+
+
 def format_number_with_dots(number: str) -> str:
     """Formatte un nombre sous forme 1.000.000"""
-    try:
-        n = int(number.replace(" ", "").replace(",", ""))
-        return f"{n:,}".replace(",", ".")
-    except:
+    digits = number.translate(_CLEAN)
+    unsigned = digits[1:] if digits[:1] in ('-', '+') else digits
+    if not unsigned.isdecimal():
         return number  # Si non numérique, on retourne brut
+    return f"{int(digits):_}".replace("_", ".")
+
+
+# Champs principaux saisis comme montants en euros
+_AMOUNT_FIELDS = frozenset({'montant_credit', 'montant_gfa', 'frais_dossier', 'montant_apports'})
+
+# Ouverture d'un dossier selon l'OS, choisie une seule fois
+if sys.platform == "win32":
+    _OPEN_FOLDER = os.startfile
+elif sys.platform == "darwin":  # macOS
+    _OPEN_FOLDER = lambda path: os.system(f"open '{path}'")
+else:  # Linux
+    _OPEN_FOLDER = lambda path: os.system(f"xdg-open '{path}'")
+
+# Motifs des conditions spéculatives / non spéculatives, compilés une seule fois
+_SPECULATIVE_RES = tuple(re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+    r'Intérêts portant sur les sommes utilisées.*?majoré de.*?fonds.*?;',
+    r'0,75%.*?l\'an.*?calculée sur le montant total du crédit autorisé.*?d\'avance.*?;',
+))
+_NON_SPECULATIVE_RES = tuple(re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+    r'Lorsque le montant du CA TTC des VEFA actées atteindra 40%.*?fonds\.',
+    r'Lorsque le montant du CA TTC des VEFA actées atteindra 40%.*?d\'avance\.',
+))
 
 
+class WorkerSignals(QObject):
+    """Signaux émis par un Worker vers le thread de l'interface"""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+
+class Worker(QRunnable):
+    """Exécute une fonction dans le pool de threads Qt"""
+    
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+    
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
 
 class ClauseWidget(QWidget):
     """Widget pour une clause optionnelle avec ses champs associés"""
     
+    changed = pyqtSignal()  # Émis à chaque modification de la case ou d'un champ
+    
+    _BOLD_FONT = None  # Police partagée par toutes les clauses, créée au premier usage
+    
+    @classmethod
+    def _bold_font(cls) -> QFont:
+        """Retourne la police des cases à cocher des clauses"""
+        if cls._BOLD_FONT is None:
+            cls._BOLD_FONT = QFont("Arial", 10, QFont.Weight.Bold)
+        return cls._BOLD_FONT
+    
     def __init__(self, clause_name: str, clause_text: str, fields: List[Dict] = None):
         super().__init__()
         self.clause_name = clause_name
         self.clause_text = clause_text
         self.fields = fields or []
         self.field_widgets = {}
+        self.field_getters = {}  # Lecture de la valeur de chaque champ, fixée à la création
         
         self.setup_ui()
     
@@ -162,8 +250,9 @@ class ClauseWidget(QWidget):
         
         # Case à cocher pour activer/désactiver la clause
         self.checkbox = QCheckBox(self.clause_name)
-        self.checkbox.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        self.checkbox.setFont(self._bold_font())
         self.checkbox.toggled.connect(self.toggle_fields)
+        self.checkbox.toggled.connect(lambda _: self.changed.emit())
         layout.addWidget(self.checkbox)
         
         # Container pour les champs
@@ -179,10 +268,15 @@ class ClauseWidget(QWidget):
                 widget = QSpinBox()
                 widget.setMaximum(999)
                 widget.setMinimum(0)
+                getter = lambda w=widget: str(w.value())
+                widget.valueChanged.connect(lambda _: self.changed.emit())
             else:
                 widget = QLineEdit()
+                getter = lambda w=widget: w.text().strip()
+                widget.textChanged.connect(lambda _: self.changed.emit())
             
             self.field_widgets[field_name] = widget
+            self.field_getters[field_name] = getter
             fields_layout.addRow(field['label'], widget)
         
         self.fields_container.setLayout(fields_layout)
@@ -201,13 +295,7 @@ class ClauseWidget(QWidget):
     
     def get_field_values(self) -> Dict[str, str]:
         """Retourne les valeurs des champs"""
-        values = {}
-        for field_name, widget in self.field_widgets.items():
-            if isinstance(widget, QSpinBox):
-                values[field_name] = str(widget.value())
-            else:
-                values[field_name] = widget.text().strip()
-        return values
+        return {field_name: getter() for field_name, getter in self.field_getters.items()}
 
 
 
@@ -254,6 +342,14 @@ class ProfileDialog(QDialog):
         layout.addLayout(buttons_layout)
         self.setLayout(layout)
     
+    def reset(self):
+        """Vide le formulaire avant une nouvelle saisie"""
+        self.nom_promoteur_edit.clear()
+        self.nom_contact_edit.clear()
+        self.adresse_promoteur_edit.clear()
+        self.civilite_combo.setCurrentIndex(0)
+        self.nom_promoteur_edit.setFocus()
+    
     def get_profile_data(self):
         """Récupère les données du profil"""
         return {
@@ -267,10 +363,49 @@ class ProfileDialog(QDialog):
 class TermsheetGenerator(QMainWindow):
     """Application principale pour générer les termsheets"""
     
+    # Style des séparateurs horizontaux
+    _HLINE = QFrame.Shape.HLine
+    _SUNKEN = QFrame.Shadow.Sunken
+    
+    # Séparateurs retirés des montants avant conversion en lettres
+    _STRIP_AMOUNT = str.maketrans('', '', ' .,')
+    
+    # Variables du template, toutes renseignées par _build_replacements
+    _PLACEHOLDERS = (
+        '[Nom du promoteur]', '[nom]', '[Adresse du promoteur]', '[date]', '[référence dossier]',
+        '[Monsieur/Madame/Messieurs]', '[NOM]', '[n° siren]', '[Ville]', '[nom de la SCCV]', '[objet]',
+        '[le bailleur]', '[nombre_credit]', '[nombre_credit_lettres]', '[montant_credit]',
+        '[montant_credit_lettres]', '[nombre_gfa]', '[nombre_gfa_lettres]', '[nombre_apport]',
+        '[nombre_apport_lettres]', '[nombre_frais_dossier]', '[nombre_frais_dossier_lettres]',
+        '[nombre_t3]', '[nombre_t4]', '[nombre_t5]', '[taux_speculatif]', '[taux_non_speculatif]',
+        '[taux_comission_engagement_speculatif]', '[taux_comission_engagement_non_speculatif]',
+        '[taux_comission_forfaitaire]', '[niveau_commercialisation_libre]', '[nom_bailleur_agrement]',
+        '[type_bloc]', '[date_echeance_gfa]', '[nom du bailleur]', '[nom_bailleur_reservation]',
+        '[type_bloc_reservation]', '[niveau_commercialisation]', '[mention_apports]',
+        '[interets_speculatifs]', '[commission_speculative]', '[interets_non_speculatifs]',
+        '[commission_non_speculative]', '[clause_garantie_actif_passif]',
+        '[clause_niveau_commercialisation_lots]', '[clause_accord_financement]',
+        '[clause_agrement_bailleur]', '[clause_engagement_pc]', '[clause_contrat_reservation]',
+        '[clause_niveau_commercialisation_libre]',
+    )
+    # Une seule regex pour toutes les variables, les plus longues d'abord
+    _PLACEHOLDER_RE = re.compile('|'.join(
+        re.escape(k) for k in sorted(_PLACEHOLDERS, key=len, reverse=True)
+    ))
+    
     def __init__(self):
         super().__init__()
         self.template_path = None
-        self.profiles_path = Path("profils.xlsx") 
+        self.profiles_path = Path("profils.json")
+        self.legacy_profiles_path = Path("profils.xlsx")
+        self._profiles = None  # Profils lus une seule fois puis gardés en mémoire
+        self._profiles_error = None  # Erreur du dernier chargement : les profils ne sont alors jamais réécrits
+        self._profiles_by_name = {}  # Index des profils par nom de promoteur
+        self._profile_dialog = None  # Créée au premier usage puis réutilisée
+        self._worker = None  # Génération en cours dans le pool de threads
+        self._values_cache = None  # Dernier résultat de get_all_values
+        self._values_dirty = True  # Passe à True dès qu'une saisie change
+        self._clause_states = []  # (activée, nom, valeurs) de chaque clause, relevés avec les valeurs
         self.setup_ui()
         self.setup_clauses()
         self.load_profiles()
@@ -283,7 +418,7 @@ class TermsheetGenerator(QMainWindow):
         if os.path.exists(default_template):
             self.template_path = default_template
             self.template_label.setText(f"Template: {default_template}")
-            self.generate_button.setEnabled(True)
+            self.generate_button.setEnabled(self._worker is None)  # Réactivé en fin de génération sinon
             self.preview_button.setEnabled(True)
         else:
             self.template_label.setText("Template par défaut non trouvé - Veuillez importer un template")
@@ -292,6 +427,16 @@ class TermsheetGenerator(QMainWindow):
     
     def setup_ui(self):
         """Configure l'interface utilisateur"""
+        # Pas de repeint pendant la construction : les signaux sont branchés à la fin
+        self.setUpdatesEnabled(False)
+        try:
+            self._build_ui()
+            self._connect_signals()
+        finally:
+            self.setUpdatesEnabled(True)
+    
+    def _build_ui(self):
+        """Construit les widgets de l'interface"""
         self.setWindowTitle("Générateur de Termsheet - LCL")
         self.setGeometry(100, 100, 900, 800)
         
@@ -312,7 +457,6 @@ class TermsheetGenerator(QMainWindow):
         
         self.template_label = QLabel("Chargement du template...")
         self.template_button = QPushButton("Changer de Template (.docx)")
-        self.template_button.clicked.connect(self.import_template)
         
         template_layout.addWidget(self.template_label)
         template_layout.addWidget(self.template_button)
@@ -327,15 +471,17 @@ class TermsheetGenerator(QMainWindow):
         # Menu déroulant pour sélectionner un profil
         self.profil_combo = QComboBox()
         self.profil_combo.addItem("-- Sélectionner un profil --")
-        self.profil_combo.currentTextChanged.connect(self.on_profil_selected)
         
         # Bouton pour créer un nouveau profil
         self.nouveau_profil_button = QPushButton("Nouveau Profil")
-        self.nouveau_profil_button.clicked.connect(self.create_new_profile)
+        
+        # Bouton pour exporter les profils au format Excel
+        self.export_profils_button = QPushButton("Exporter (.xlsx)")
         
         profils_layout.addWidget(QLabel("Profil :"))
         profils_layout.addWidget(self.profil_combo)
         profils_layout.addWidget(self.nouveau_profil_button)
+        profils_layout.addWidget(self.export_profils_button)
         profils_layout.addStretch()
         
         profils_group.setLayout(profils_layout)
@@ -366,12 +512,11 @@ class TermsheetGenerator(QMainWindow):
         ]
         
         for field_key, field_label in main_fields:
-            if field_key in ['montant_credit', 'montant_gfa', 'frais_dossier', 'montant_apports']:
+            # Parent donné dès la création pour éviter un re-parentage par le layout
+            widget = QLineEdit(main_info_group)
+            if field_key in _AMOUNT_FIELDS:
                 # Champs numériques pour les montants
-                widget = QLineEdit()
                 widget.setPlaceholderText("Entrez le montant en euros")
-            else:
-                widget = QLineEdit()
             
             self.fields[field_key] = widget
             main_info_layout.addRow(field_label, widget)
@@ -416,10 +561,7 @@ class TermsheetGenerator(QMainWindow):
         taux_layout.addRow('Taux commission engagement spéculatif', self.taux_comission_engagement_speculatif)
         
         # Séparateur
-        separator1 = QFrame()
-        separator1.setFrameShape(QFrame.Shape.HLine)
-        separator1.setFrameShadow(QFrame.Shadow.Sunken)
-        taux_layout.addRow(separator1)
+        taux_layout.addRow(self._make_hline())
         
         # Cases à cocher pour les conditions non spéculatives
         self.conditions_non_speculatives_checkbox = QCheckBox("Inclure les conditions non spéculatives")
@@ -443,10 +585,7 @@ class TermsheetGenerator(QMainWindow):
         taux_layout.addRow('Taux commission engagement non spéculatif', self.taux_comission_engagement_non_speculatif)
         
         # Séparateur
-        separator2 = QFrame()
-        separator2.setFrameShape(QFrame.Shape.HLine)
-        separator2.setFrameShadow(QFrame.Shadow.Sunken)
-        taux_layout.addRow(separator2)
+        taux_layout.addRow(self._make_hline())
         
         # Taux commission forfaitaire
         self.taux_comission_forfaitaire = QDoubleSpinBox()
@@ -485,6 +624,19 @@ class TermsheetGenerator(QMainWindow):
         commercialisation_group.setLayout(commercialisation_layout)
         scroll_layout.addWidget(commercialisation_group)
         
+        # Taux et niveaux, lus d'un bloc par _snapshot_rates
+        self._rate_widgets = {
+            'taux_speculatif': self.taux_speculatif,
+            'taux_non_speculatif': self.taux_non_speculatif,
+            'taux_comission_engagement_speculatif': self.taux_comission_engagement_speculatif,
+            'taux_comission_engagement_non_speculatif': self.taux_comission_engagement_non_speculatif,
+            'taux_comission_forfaitaire': self.taux_comission_forfaitaire,
+            'niveau_commercialisation': self.niveau_commercialisation,
+        }
+        for widget in self._rate_widgets.values():
+            # valueChanged seulement à la validation, pas à chaque touche
+            widget.setKeyboardTracking(False)
+        
         # Section clauses optionnelles
         self.clauses_group = QGroupBox("Clauses Optionnelles")
         self.clauses_layout = QVBoxLayout()
@@ -495,11 +647,9 @@ class TermsheetGenerator(QMainWindow):
         buttons_layout = QHBoxLayout()
         
         self.generate_button = QPushButton("Générer le Termsheet")
-        self.generate_button.clicked.connect(self.generate_termsheet)
         self.generate_button.setEnabled(False)
         
         self.preview_button = QPushButton("Aperçu")
-        self.preview_button.clicked.connect(self.preview_termsheet)
         self.preview_button.setEnabled(False)
         
         buttons_layout.addWidget(self.preview_button)
@@ -513,113 +663,189 @@ class TermsheetGenerator(QMainWindow):
         
         main_layout.addWidget(scroll)
         main_widget.setLayout(main_layout)
-
+    
+    def _make_hline(self) -> QFrame:
+        """Crée un séparateur horizontal"""
+        line = QFrame()
+        line.setFrameShape(self._HLINE)
+        line.setFrameShadow(self._SUNKEN)
+        return line
+    
+    def _connect_signals(self):
+        """Branche les signaux une fois tous les widgets créés"""
+        self.template_button.clicked.connect(self.import_template)
+        self.profil_combo.currentTextChanged.connect(self.on_profil_selected)
+        self.nouveau_profil_button.clicked.connect(self.create_new_profile)
+        self.export_profils_button.clicked.connect(self.export_profiles_xlsx)
+        self.generate_button.clicked.connect(self.generate_termsheet)
+        self.preview_button.clicked.connect(self.preview_termsheet)
+        
+        # Toute saisie invalide les valeurs mises en cache par get_all_values
+        for widget in self.fields.values():
+            widget.textChanged.connect(self._invalidate_values)
+        self.civilite_combo.currentTextChanged.connect(self._invalidate_values)
+        self.objet_text.textChanged.connect(self._invalidate_values)
+        for widget in self._rate_widgets.values():
+            widget.valueChanged.connect(self._invalidate_values)
+        for checkbox in (self.inclure_apports_checkbox,
+                         self.conditions_speculatives_checkbox,
+                         self.conditions_non_speculatives_checkbox):
+            checkbox.toggled.connect(self._invalidate_values)
+    
+    def _invalidate_values(self, *args):
+        """Force le recalcul des valeurs au prochain get_all_values"""
+        self._values_dirty = True
 
     
     def load_profiles(self):
-        """Charge les profils depuis le fichier Excel"""
-        try:
-            if self.profiles_path.exists():
-                df = pd.read_excel(self.profiles_path)
-                
-                # Vérifier que les colonnes existent
-                required_columns = ['Nom du promoteur', 'Nom du contact', 'Adresse du promoteur', 'Civilité']
-                if all(col in df.columns for col in required_columns):
-                    # Ajouter les profils au combo
-                    for promoteur in df['Nom du promoteur'].dropna():
-                        self.profil_combo.addItem(str(promoteur))
+        """Charge les profils depuis le fichier JSON"""
+        if self._profiles is None:
+            try:
+                if self.profiles_path.exists() or self.legacy_profiles_path.exists():
+                    # profils.json, ou reprise unique des profils de l'ancien fichier Excel
+                    self._profiles = read_profiles(self.profiles_path, self.legacy_profiles_path)
                 else:
-                    print("Le fichier Excel ne contient pas les bonnes colonnes")
-            else:
-                # Créer le fichier Excel avec les en-têtes
-                self.create_empty_profiles_file()
-                
-        except Exception as e:
-            print(f"Erreur lors du chargement des profils : {e}")
+                    # Créer le fichier de profils vide
+                    self.create_empty_profiles_file()
+                self._profiles_error = None
+            except Exception as e:
+                # Les profils restent non chargés : save_profile refusera d'écraser le fichier
+                self._profiles_error = e
+                QMessageBox.critical(
+                    self, "Erreur",
+                    f"Erreur lors du chargement des profils : {e}\n\n"
+                    "Aucun profil ne sera enregistré tant que le fichier n'est pas corrigé."
+                )
+                return
+        
+        self._profiles_by_name = {
+            profile['nom_promoteur']: profile
+            for profile in self._profiles
+            if profile.get('nom_promoteur')
+        }
+        
+        # Ajouter les profils au combo en une fois, sans déclencher on_profil_selected
+        self.profil_combo.blockSignals(True)
+        try:
+            self.profil_combo.addItems(list(self._profiles_by_name))
+        finally:
+            self.profil_combo.blockSignals(False)
 
     def create_empty_profiles_file(self):
-        """Crée un fichier Excel vide avec les en-têtes"""
+        """Crée un fichier de profils vide"""
+        self._profiles = []
         try:
-            df = pd.DataFrame(columns=['Nom du promoteur', 'Nom du contact', 'Adresse du promoteur', 'Civilité'])
-            df.to_excel(self.profiles_path, index=False)
+            write_profiles(self.profiles_path, self._profiles)
         except Exception as e:
             print(f"Erreur lors de la création du fichier profils : {e}")
 
+    def profiles_unavailable(self) -> bool:
+        """Prévient l'utilisateur si les profils n'ont pas pu être chargés"""
+        if self._profiles is not None:
+            return False
+        QMessageBox.critical(
+            self, "Erreur",
+            f"Les profils n'ont pas pu être chargés ({self._profiles_error}).\n"
+            "Opération annulée pour ne pas écraser les profils existants."
+        )
+        return True
+
+    def export_profiles_xlsx(self):
+        """Exporte les profils vers un fichier Excel"""
+        if self.profiles_unavailable():
+            return
+        
+        output_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Exporter les profils",
+            str(self.legacy_profiles_path),
+            "Fichiers Excel (*.xlsx);;Tous les fichiers (*)"
+        )
+        
+        if not output_path:
+            return
+        
+        try:
+            write_profiles_xlsx(output_path, self._profiles)
+            QMessageBox.information(self, "Succès", "Profils exportés avec succès !")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'export des profils : {e}")
+
     def on_profil_selected(self, profil_name):
         """Méthode appelée quand un profil est sélectionné"""
         if profil_name == "-- Sélectionner un profil --" or not profil_name:
             return
             
         try:
-            if self.profiles_path.exists():
-                df = pd.read_excel(self.profiles_path)
-                
-                # Trouver la ligne correspondant au profil
-                profil_row = df[df['Nom du promoteur'] == profil_name]
+            # Trouver le profil correspondant
+            profile = self._profiles_by_name.get(profil_name)
+            
+            if profile is not None:
+                # Remplir les champs
+                self.fields['nom_promoteur'].setText(profile['nom_promoteur'])
+                self.fields['nom_contact'].setText(profile['nom_contact'])
+                self.fields['adresse_promoteur'].setText(profile['adresse_promoteur'])
                 
-                if not profil_row.empty:
-                    # Remplir les champs
-                    self.fields['nom_promoteur'].setText(str(profil_row.iloc[0]['Nom du promoteur']))
-                    self.fields['nom_contact'].setText(str(profil_row.iloc[0]['Nom du contact']))
-                    self.fields['adresse_promoteur'].setText(str(profil_row.iloc[0]['Adresse du promoteur']))
-                    
-                    # Sélectionner la civilité dans le combo
-                    civilite = str(profil_row.iloc[0]['Civilité'])
-                    if civilite in ['Monsieur', 'Madame', 'Messieurs']:
-                        self.civilite_combo.setCurrentText(civilite)
+                # Sélectionner la civilité dans le combo
+                civilite = profile['civilite']
+                if civilite in ['Monsieur', 'Madame', 'Messieurs']:
+                    self.civilite_combo.setCurrentText(civilite)
                         
         except Exception as e:
             QMessageBox.warning(self, "Erreur", f"Erreur lors du chargement du profil : {e}")
 
+    def add_profile_to_combo(self, nom_promoteur: str):
+        """Ajoute un profil à la liste s'il n'y figure pas déjà"""
+        if nom_promoteur and self.profil_combo.findText(nom_promoteur) == -1:
+            self.profil_combo.addItem(nom_promoteur)
+
     def create_new_profile(self):
         """Ouvre une boîte de dialogue pour créer un nouveau profil"""
-        dialog = ProfileDialog(self)
+        if self._profile_dialog is None:
+            self._profile_dialog = ProfileDialog(self)
+        dialog = self._profile_dialog
+        dialog.reset()
         if dialog.exec() == QDialog.DialogCode.Accepted:
             profile_data = dialog.get_profile_data()
-            self.save_profile_to_excel(profile_data)
-            
-            # Rafraîchir la liste des profils
-            self.profil_combo.clear()
-            self.profil_combo.addItem("-- Sélectionner un profil --")
-            self.load_profiles()
-            
-            # Sélectionner le nouveau profil
-            self.profil_combo.setCurrentText(profile_data['nom_promoteur'])
+            if self.save_profile(profile_data):
+                nom_promoteur = profile_data['nom_promoteur']
+                
+                # Mettre à jour la liste des profils sans la reconstruire
+                self.add_profile_to_combo(nom_promoteur)
+                
+                # Sélectionner le nouveau profil (ou recharger ses champs s'il l'était déjà)
+                if self.profil_combo.currentText() == nom_promoteur:
+                    self.on_profil_selected(nom_promoteur)
+                else:
+                    self.profil_combo.setCurrentText(nom_promoteur)
 
-    def save_profile_to_excel(self, profile_data):
-        """Sauvegarde un profil dans le fichier Excel"""
+    def save_profile(self, profile_data) -> bool:
+        """Sauvegarde un profil dans le fichier JSON, retourne True en cas de succès"""
+        if self.profiles_unavailable():
+            return False
+        
         try:
-            # Charger le fichier existant ou créer un nouveau DataFrame
-            if self.profiles_path.exists():
-                df = pd.read_excel(self.profiles_path)
-            else:
-                df = pd.DataFrame(columns=['Nom du promoteur', 'Nom du contact', 'Adresse du promoteur', 'Civilité'])
+            profile = dict(profile_data)
+            profiles = list(self._profiles)
             
-            # Vérifier si le profil existe déjà
-            if profile_data['nom_promoteur'] in df['Nom du promoteur'].values:
-                # Mettre à jour
-                df.loc[df['Nom du promoteur'] == profile_data['nom_promoteur']] = [
-                    profile_data['nom_promoteur'],
-                    profile_data['nom_contact'],
-                    profile_data['adresse_promoteur'],
-                    profile_data['civilite']
-                ]
+            # Mettre à jour le profil s'il existe déjà, sinon l'ajouter
+            existing = self._profiles_by_name.get(profile['nom_promoteur'])
+            if existing is not None:
+                profiles[profiles.index(existing)] = profile
             else:
-                # Ajouter nouvelle ligne
-                new_row = pd.DataFrame([{
-                    'Nom du promoteur': profile_data['nom_promoteur'],
-                    'Nom du contact': profile_data['nom_contact'],
-                    'Adresse du promoteur': profile_data['adresse_promoteur'],
-                    'Civilité': profile_data['civilite']
-                }])
-                df = pd.concat([df, new_row], ignore_index=True)
+                profiles.append(profile)
             
-            # Sauvegarder
-            df.to_excel(self.profiles_path, index=False)
+            # Sauvegarder puis mettre à jour la liste et l'index en mémoire
+            write_profiles(self.profiles_path, profiles)
+            self._profiles = profiles
+            self._profiles_by_name[profile['nom_promoteur']] = profile
             QMessageBox.information(self, "Succès", "Profil sauvegardé avec succès !")
+            return True
             
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur lors de la sauvegarde : {e}")
+            return False
 
     def check_and_propose_save_profile(self):
         """Vérifie si un profil doit être proposé à la sauvegarde"""
@@ -649,12 +875,9 @@ class TermsheetGenerator(QMainWindow):
                         'adresse_promoteur': adresse_promoteur,
                         'civilite': civilite
                     }
-                    self.save_profile_to_excel(profile_data)
-                    
-                    # Rafraîchir la liste
-                    self.profil_combo.clear()
-                    self.profil_combo.addItem("-- Sélectionner un profil --")
-                    self.load_profiles()
+                    if self.save_profile(profile_data):
+                        # Ajouter le promoteur à la liste
+                        self.add_profile_to_combo(nom_promoteur)
     
     def setup_clauses(self):
         """Configure les clauses optionnelles"""
@@ -720,14 +943,12 @@ class TermsheetGenerator(QMainWindow):
                 clause_config['text'],
                 clause_config['fields']
             )
+            clause_widget.changed.connect(self._invalidate_values)
             self.clause_widgets.append(clause_widget)
             self.clauses_layout.addWidget(clause_widget)
             
             # Ajouter un séparateur
-            line = QFrame()
-            line.setFrameShape(QFrame.Shape.HLine)
-            line.setFrameShadow(QFrame.Shadow.Sunken)
-            self.clauses_layout.addWidget(line)
+            self.clauses_layout.addWidget(self._make_hline())
     
     def import_template(self):
         """Importe un template Word"""
@@ -741,18 +962,26 @@ class TermsheetGenerator(QMainWindow):
         if file_path:
             self.template_path = file_path
             self.template_label.setText(f"Template: {Path(file_path).name}")
-            self.generate_button.setEnabled(True)
+            self.generate_button.setEnabled(self._worker is None)  # Réactivé en fin de génération sinon
             self.preview_button.setEnabled(True)
     
+    def _snapshot_rates(self) -> Dict[str, float]:
+        """Lit en une fois la valeur de tous les taux"""
+        return {name: widget.value() for name, widget in self._rate_widgets.items()}
+    
     def get_all_values(self) -> Dict[str, str]:
         """Récupère toutes les valeurs saisies"""
+        # Rien n'a changé depuis le dernier appel (aperçu puis génération)
+        if not self._values_dirty:
+            return self._values_cache
+        
         values = {}
         
         # Champs principaux
         for field_key, widget in self.fields.items():
             text = widget.text().strip()
             # Pour les montants, applique le formatage à points
-            if field_key in ['montant_credit', 'montant_gfa', 'frais_dossier', 'montant_apports']:
+            if field_key in _AMOUNT_FIELDS:
                 text = format_number_with_dots(text)
             values[field_key] = text
 
@@ -764,14 +993,15 @@ class TermsheetGenerator(QMainWindow):
         values['objet'] = self.objet_text.toPlainText().strip()
         
         # Nouveaux champs de taux
-        values['taux_speculatif'] = f"{self.taux_speculatif.value():.2f}".replace('.', ',')
-        values['taux_non_speculatif'] = f"{self.taux_non_speculatif.value():.2f}".replace('.', ',')
-        values['taux_comission_engagement_speculatif'] = f"{self.taux_comission_engagement_speculatif.value():.2f}".replace('.', ',')
-        values['taux_comission_engagement_non_speculatif'] = f"{self.taux_comission_engagement_non_speculatif.value():.2f}".replace('.', ',')
-        values['taux_comission_forfaitaire'] = f"{self.taux_comission_forfaitaire.value():.2f}".replace('.', ',')
+        rates = self._snapshot_rates()
+        values['taux_speculatif'] = f"{rates['taux_speculatif']:.2f}".replace('.', ',')
+        values['taux_non_speculatif'] = f"{rates['taux_non_speculatif']:.2f}".replace('.', ',')
+        values['taux_comission_engagement_speculatif'] = f"{rates['taux_comission_engagement_speculatif']:.2f}".replace('.', ',')
+        values['taux_comission_engagement_non_speculatif'] = f"{rates['taux_comission_engagement_non_speculatif']:.2f}".replace('.', ',')
+        values['taux_comission_forfaitaire'] = f"{rates['taux_comission_forfaitaire']:.2f}".replace('.', ',')
         
         # Niveaux de commercialisation
-        values['niveau_commercialisation'] = f"{int(self.niveau_commercialisation.value())}"
+        values['niveau_commercialisation'] = f"{int(rates['niveau_commercialisation'])}"
         
         # État des cases à cocher
         values['inclure_apports'] = self.inclure_apports_checkbox.isChecked()
@@ -779,34 +1009,37 @@ class TermsheetGenerator(QMainWindow):
         values['conditions_non_speculatives'] = self.conditions_non_speculatives_checkbox.isChecked()
         
         # Récupérer les valeurs des clauses optionnelles
-        for clause_widget in self.clause_widgets:
-            if clause_widget.is_enabled():
-                field_values = clause_widget.get_field_values()
+        self._clause_states = self._snapshot_clauses()
+        for enabled, _, field_values in self._clause_states:
+            if enabled:
                 values.update(field_values)
         
         # Convertir les montants en lettres
         try:
-            if values['montant_credit']:
-                montant = int(values['montant_credit'].replace(' ', '').replace('.', '').replace(',', ''))
-                values['montant_credit_lettres'] = NumberToWords.convert(montant)
-
-            if values['montant_gfa']:
-                montant = int(values['montant_gfa'].replace(' ', '').replace('.', '').replace(',', ''))
-                values['montant_gfa_lettres'] = NumberToWords.convert(montant)
-
-            if values['frais_dossier']:
-                montant = int(values['frais_dossier'].replace(' ', '').replace('.', '').replace(',', ''))
-                values['frais_dossier_lettres'] = NumberToWords.convert(montant)
-
-            if values['montant_apports']:
-                montant = int(values['montant_apports'].replace(' ', '').replace('.', '').replace(',', ''))
-                values['montant_apports_lettres'] = NumberToWords.convert(montant)
-
+            values['montant_credit_lettres'] = self._to_lettres(values['montant_credit'])
+            values['montant_gfa_lettres'] = self._to_lettres(values['montant_gfa'])
+            values['frais_dossier_lettres'] = self._to_lettres(values['frais_dossier'])
+            values['montant_apports_lettres'] = self._to_lettres(values['montant_apports'])
         except ValueError:
             pass  # Ignorer les erreurs de conversion
         
+        self._values_cache = values
+        self._values_dirty = False
         return values
     
+    def _snapshot_clauses(self) -> List[tuple]:
+        """Relève en une fois l'état et les valeurs de chaque clause"""
+        snapshot = []
+        for clause_widget in self.clause_widgets:
+            enabled = clause_widget.is_enabled()
+            field_values = clause_widget.get_field_values() if enabled else {}
+            snapshot.append((enabled, clause_widget.clause_name, field_values))
+        return snapshot
+    
+    def _to_lettres(self, montant: str) -> str:
+        """Convertit un montant saisi (avec séparateurs) en toutes lettres"""
+        return NumberToWords.convert(int(montant.translate(self._STRIP_AMOUNT))) if montant else ''
+    
     def preview_termsheet(self):
         """Affiche un aperçu des valeurs qui seront remplacées"""
         if not self.template_path:
@@ -815,32 +1048,33 @@ class TermsheetGenerator(QMainWindow):
         
         values = self.get_all_values()
         
-        # Créer le texte d'aperçu
-        preview_text = "=== APERÇU DES VALEURS ===\n\n"
+        # Créer le texte d'aperçu ligne par ligne, assemblé une seule fois à la fin
+        lines = ["=== APERÇU DES VALEURS ===", ""]
         
-        preview_text += "CHAMPS PRINCIPAUX:\n"
+        lines.append("CHAMPS PRINCIPAUX:")
         for key, value in values.items():
             if value and not key.endswith('_lettres') and key not in ['inclure_apports', 'conditions_speculatives', 'conditions_non_speculatives']:
-                preview_text += f"[{key.upper()}] = {value}\n"
+                lines.append(f"[{key.upper()}] = {value}")
         
-        preview_text += "\n\nOPTIONS:\n"
+        lines += ["", "", "OPTIONS:"]
         if values.get('inclure_apports'):
-            preview_text += "✓ Mention '(en y ajoutant les apports)' incluse\n"
+            lines.append("✓ Mention '(en y ajoutant les apports)' incluse")
         if values.get('conditions_speculatives'):
-            preview_text += "✓ Conditions spéculatives incluses\n"
+            lines.append("✓ Conditions spéculatives incluses")
         if values.get('conditions_non_speculatives'):
-            preview_text += "✓ Conditions non spéculatives incluses\n"
+            lines.append("✓ Conditions non spéculatives incluses")
         
-        preview_text += "\n\nCLAUSES OPTIONNELLES:\n"
-        for clause_widget in self.clause_widgets:
-            if clause_widget.is_enabled():
-                preview_text += f"✓ {clause_widget.clause_name}\n"
-                field_values = clause_widget.get_field_values()
+        lines += ["", "", "CLAUSES OPTIONNELLES:"]
+        for enabled, clause_name, field_values in self._clause_states:
+            if enabled:
+                lines.append(f"✓ {clause_name}")
                 for field_name, field_value in field_values.items():
                     if field_value:
-                        preview_text += f"  - {field_name}: {field_value}\n"
+                        lines.append(f"  - {field_name}: {field_value}")
             else:
-                preview_text += f"✗ {clause_widget.clause_name} (désactivée)\n"
+                lines.append(f"✗ {clause_name} (désactivée)")
+        lines.append("")
+        preview_text = "\n".join(lines)
         
         # Afficher dans une boîte de dialogue
         msg = QMessageBox()
@@ -851,30 +1085,66 @@ class TermsheetGenerator(QMainWindow):
     
     def generate_termsheet(self):
         """Génère le fichier Word final"""
+        # Une seule génération à la fois : le bouton est réactivé à la fin de la précédente
+        if self._worker is not None:
+            return
+        
         if not self.template_path:
             QMessageBox.warning(self, "Erreur", "Veuillez d'abord importer un template.")
             return
         
+        try:
+            from docx import Document
+        except ImportError:
+            QMessageBox.critical(
+                self,
+                "Erreur",
+                "Le module python-docx n'est pas installé.\nInstallez-le avec : pip install python-docx"
+            )
+            return
+        
         # AJOUTER CETTE LIGNE :
         self.check_and_propose_save_profile()
         
         try:
-            # Charger le document template
-            doc = Document(self.template_path)
-            
-            # Récupérer toutes les valeurs
+            # Lire les widgets ici : seul le thread de l'interface peut y accéder
             values = self.get_all_values()
-            
-            # Remplacer les variables dans le document
-            self.replace_variables_in_document(doc, values)
-            
-            # Traiter les clauses optionnelles
-            self.process_optional_clauses(doc)
-            
-            # Sauvegarder le fichier généré
+            clauses = [enabled for enabled, _, _ in self._clause_states]
             output_path = self.get_output_path()
-            doc.save(output_path)
-            
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de la génération:\n{str(e)}")
+            return
+        
+        # Construire le document en arrière-plan pour ne pas figer l'interface
+        self.generate_button.setEnabled(False)
+        self._worker = Worker(self.build_termsheet, Document, self.template_path, values, clauses, output_path)
+        self._worker.signals.finished.connect(self.on_termsheet_generated)
+        self._worker.signals.error.connect(self.on_termsheet_error)
+        QThreadPool.globalInstance().start(self._worker)
+    
+    def build_termsheet(self, document_class, template_path: str, values: Dict[str, str],
+                        clauses: List[bool], output_path: str) -> str:
+        """Construit et sauvegarde le termsheet (exécuté hors du thread de l'interface)"""
+        # Charger le document template
+        doc = document_class(template_path)
+        
+        # Remplacer les variables dans le document
+        self.replace_variables_in_document(doc, values, clauses)
+        
+        # Traiter les clauses optionnelles
+        self.process_optional_clauses(doc)
+        
+        # Sauvegarder le fichier généré, par blocs de 64 Ko (partages réseau)
+        with open(output_path, 'wb', buffering=1 << 16) as f:
+            doc.save(f)
+        return output_path
+    
+    def on_termsheet_generated(self, output_path: str):
+        """Termine la génération dans le thread de l'interface"""
+        self.generate_button.setEnabled(True)
+        self._worker = None
+        
+        try:
             # Message de succès
             reply = QMessageBox.question(
                 self,
@@ -884,223 +1154,209 @@ class TermsheetGenerator(QMainWindow):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                # Ouvrir le dossier selon l'OS
-                import platform
-                if platform.system() == "Windows":
-                    os.startfile(Path(output_path).parent)
-                elif platform.system() == "Darwin":  # macOS
-                    os.system(f"open '{Path(output_path).parent}'")
-                else:  # Linux
-                    os.system(f"xdg-open '{Path(output_path).parent}'")
+                _OPEN_FOLDER(Path(output_path).parent)
         
         except Exception as e:
-            QMessageBox.critical(self, "Erreur", f"Erreur lors de la génération:\n{str(e)}")
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'ouverture du dossier:\n{str(e)}")
     
-    def replace_variables_in_document(self, doc: Document, values: Dict[str, str]):
+    def on_termsheet_error(self, message: str):
+        """Signale une erreur survenue pendant la génération"""
+        self.generate_button.setEnabled(True)
+        self._worker = None
+        QMessageBox.critical(self, "Erreur", f"Erreur lors de la génération:\n{message}")
+    
+    def replace_variables_in_document(self, doc: "Document", values: Dict[str, str], clauses: List[bool]):
         """Remplace toutes les variables [VAR] dans le document"""
-        # Remplacer dans les paragraphes
-        for paragraph in doc.paragraphs:
-            self.replace_in_paragraph(paragraph, values)
+        from docx.opc.constants import RELATIONSHIP_TYPE as RT
+        from docx.oxml.ns import qn
+        from docx.text.paragraph import Paragraph
         
-        # Remplacer dans les tableaux
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        self.replace_in_paragraph(paragraph, values)
-        
-        # Remplacer dans les en-têtes et pieds de page
-        for section in doc.sections:
-            if section.header:
-                for paragraph in section.header.paragraphs:
-                    self.replace_in_paragraph(paragraph, values)
-            if section.footer:
-                for paragraph in section.footer.paragraphs:
-                    self.replace_in_paragraph(paragraph, values)
+        replacements = self._build_replacements(values, clauses)
+        
+        # Corps du document (tableaux compris) puis en-têtes et pieds de page
+        roots = [doc.element.body]
+        roots.extend(
+            rel.target_part.element for rel in doc.part.rels.values()
+            if rel.reltype in (RT.HEADER, RT.FOOTER)
+        )
+        
+        # Parcours direct des <w:p> : seuls les paragraphes contenant une variable sont enveloppés
+        w_p, w_t = qn('w:p'), qn('w:t')
+        for root in roots:
+            for p in list(root.iter(w_p)):
+                if '[' in ''.join(t.text or '' for t in p.iter(w_t)):
+                    self.replace_in_paragraph(Paragraph(p, None), replacements)
     
-    def replace_in_paragraph(self, paragraph, values: Dict[str, str]):
-        """Remplace les variables dans un paragraphe en préservant le formatage"""
-        original_text = paragraph.text
+    def _build_replacements(self, values: Dict[str, str], clauses: List[bool]) -> Dict[str, str]:
+        """Construit une seule fois pour tout le document le mapping des variables vers les valeurs"""
+        # Champs absents lus comme chaînes vides
+        v = defaultdict(str, values)
         
         # Mapping des variables vers les valeurs
         replacements = {
-            '[Nom du promoteur]': values.get('nom_promoteur', ''),
-            '[nom]': values.get('nom_contact', ''),
-            '[Adresse du promoteur]': values.get('adresse_promoteur', ''),
-            '[date]': values.get('date', ''),
-            '[référence dossier]': values.get('reference_dossier', ''),
-            '[Monsieur/Madame/Messieurs]': values.get('civilite', ''),
-            '[NOM]': values.get('nom_sccv', ''),
-            '[n° siren]': values.get('numero_siren', ''),
-            '[Ville]': values.get('ville_rcs', ''),
-            '[nom de la SCCV]': values.get('nom_sccv', ''),
-            '[objet]': values.get('objet', ''),
-            '[le bailleur]': values.get('nom_bailleur_agrement', ''),
-            '[nombre_credit]': values.get('montant_credit', ''),
-            '[nombre_credit_lettres]': values.get('montant_credit_lettres', ''),
-            '[montant_credit]': values.get('montant_credit', ''),
-            '[montant_credit_lettres]': values.get('montant_credit_lettres', ''),
-            '[nombre_gfa]': values.get('montant_gfa', ''),
-            '[nombre_gfa_lettres]': values.get('montant_gfa_lettres', ''),
-            '[nombre_apport]': values.get('montant_apports', ''),
-            '[nombre_apport_lettres]': values.get('montant_apports_lettres', ''),
-            '[nombre_frais_dossier]': values.get('frais_dossier', ''),
-            '[nombre_frais_dossier_lettres]': values.get('frais_dossier_lettres', ''),
-            '[nombre_t3]': values.get('nombre_t3', ''),
-            '[nombre_t4]': values.get('nombre_t4', ''),
-            '[nombre_t5]': values.get('nombre_t5', ''),
-            '[taux_speculatif]': values.get('taux_speculatif', ''),
-            '[taux_non_speculatif]': values.get('taux_non_speculatif', ''),
-            '[taux_comission_engagement_speculatif]': values.get('taux_comission_engagement_speculatif', ''),
-            '[taux_comission_engagement_non_speculatif]': values.get('taux_comission_engagement_non_speculatif', ''),
-            '[taux_comission_forfaitaire]': values.get('taux_comission_forfaitaire', ''),
-            '[niveau_commercialisation_libre]': values.get('niveau_commercialisation_libre', ''),
-            '[nom_bailleur_agrement]': values.get('nom_bailleur_agrement', ''),
-            '[type_bloc]': values.get('type_bloc', ''),
-            '[date_echeance_gfa]': values.get('date_echeance_gfa', ''),
-            '[nom du bailleur]': values.get('nom_bailleur_reservation', ''),
-            '[nom_bailleur_reservation]': values.get('nom_bailleur_reservation', ''),
-            '[type_bloc_reservation]': values.get('type_bloc_reservation', ''),
+            '[Nom du promoteur]': v['nom_promoteur'],
+            '[nom]': v['nom_contact'],
+            '[Adresse du promoteur]': v['adresse_promoteur'],
+            '[date]': v['date'],
+            '[référence dossier]': v['reference_dossier'],
+            '[Monsieur/Madame/Messieurs]': v['civilite'],
+            '[NOM]': v['nom_sccv'],
+            '[n° siren]': v['numero_siren'],
+            '[Ville]': v['ville_rcs'],
+            '[nom de la SCCV]': v['nom_sccv'],
+            '[objet]': v['objet'],
+            '[le bailleur]': v['nom_bailleur_agrement'],
+            '[nombre_credit]': v['montant_credit'],
+            '[nombre_credit_lettres]': v['montant_credit_lettres'],
+            '[montant_credit]': v['montant_credit'],
+            '[montant_credit_lettres]': v['montant_credit_lettres'],
+            '[nombre_gfa]': v['montant_gfa'],
+            '[nombre_gfa_lettres]': v['montant_gfa_lettres'],
+            '[nombre_apport]': v['montant_apports'],
+            '[nombre_apport_lettres]': v['montant_apports_lettres'],
+            '[nombre_frais_dossier]': v['frais_dossier'],
+            '[nombre_frais_dossier_lettres]': v['frais_dossier_lettres'],
+            '[nombre_t3]': v['nombre_t3'],
+            '[nombre_t4]': v['nombre_t4'],
+            '[nombre_t5]': v['nombre_t5'],
+            '[taux_speculatif]': v['taux_speculatif'],
+            '[taux_non_speculatif]': v['taux_non_speculatif'],
+            '[taux_comission_engagement_speculatif]': v['taux_comission_engagement_speculatif'],
+            '[taux_comission_engagement_non_speculatif]': v['taux_comission_engagement_non_speculatif'],
+            '[taux_comission_forfaitaire]': v['taux_comission_forfaitaire'],
+            '[niveau_commercialisation_libre]': v['niveau_commercialisation_libre'],
+            '[nom_bailleur_agrement]': v['nom_bailleur_agrement'],
+            '[type_bloc]': v['type_bloc'],
+            '[date_echeance_gfa]': v['date_echeance_gfa'],
+            '[nom du bailleur]': v['nom_bailleur_reservation'],
+            '[nom_bailleur_reservation]': v['nom_bailleur_reservation'],
+            '[type_bloc_reservation]': v['type_bloc_reservation'],
         }
         
         # Gestion du niveau de commercialisation avec/sans apports
         if values.get('inclure_apports', False):
-            replacements['[niveau_commercialisation]'] = f"{values.get('niveau_commercialisation', '')}"
+            replacements['[niveau_commercialisation]'] = f"{v['niveau_commercialisation']}"
             replacements['[mention_apports]'] = '(en y ajoutant les apports),'
         else:
-            replacements['[niveau_commercialisation]'] = f"{values.get('niveau_commercialisation', '')}"
+            replacements['[niveau_commercialisation]'] = f"{v['niveau_commercialisation']}"
             replacements['[mention_apports]'] = ''
         
         # Gestion des conditions spéculatives
         if values.get('conditions_speculatives', True):
-            replacements['[interets_speculatifs]'] = f"Intérêts portant sur les sommes utilisées calculés sur l'EURIBOR de la durée du tirage (minimum un mois -- maximum 12 mois) majoré de {values.get('taux_speculatif', '')}% l'an, perçus d'avance le jour de la mise à disposition des fonds ;"
-            replacements['[commission_speculative]'] = f"{values.get('taux_comission_engagement_speculatif', '')}% l'an, calculée sur le montant total du crédit autorisé et perçue trimestriellement et d'avance ;"
+            replacements['[interets_speculatifs]'] = f"Intérêts portant sur les sommes utilisées calculés sur l'EURIBOR de la durée du tirage (minimum un mois -- maximum 12 mois) majoré de {v['taux_speculatif']}% l'an, perçus d'avance le jour de la mise à disposition des fonds ;"
+            replacements['[commission_speculative]'] = f"{v['taux_comission_engagement_speculatif']}% l'an, calculée sur le montant total du crédit autorisé et perçue trimestriellement et d'avance ;"
         else:
             replacements['[interets_speculatifs]'] = ''
             replacements['[commission_speculative]'] = ''
         
         # Gestion des conditions non spéculatives
         if values.get('conditions_non_speculatives', True):
-            replacements['[interets_non_speculatifs]'] = f"Lorsque le montant du CA TTC des VEFA actées atteindra 40% et plus du Prix de Revient TTC, les intérêts portant sur les sommes utilisées calculés sur l'EURIBOR de la durée du tirage (minimum un mois -- maximum 12 mois) seront ramenés à {values.get('taux_non_speculatif', '')}% l'an, perçus d'avance le jour de la mise à disposition des fonds."
-            replacements['[commission_non_speculative]'] = f"Lorsque le montant du CA TTC des VEFA actées atteindra 40% et plus du Prix de Revient TTC, {values.get('taux_comission_engagement_non_speculatif', '')}% l'an, calculée sur le montant total du crédit autorisé et perçue trimestriellement et d'avance."
+            replacements['[interets_non_speculatifs]'] = f"Lorsque le montant du CA TTC des VEFA actées atteindra 40% et plus du Prix de Revient TTC, les intérêts portant sur les sommes utilisées calculés sur l'EURIBOR de la durée du tirage (minimum un mois -- maximum 12 mois) seront ramenés à {v['taux_non_speculatif']}% l'an, perçus d'avance le jour de la mise à disposition des fonds."
+            replacements['[commission_non_speculative]'] = f"Lorsque le montant du CA TTC des VEFA actées atteindra 40% et plus du Prix de Revient TTC, {v['taux_comission_engagement_non_speculatif']}% l'an, calculée sur le montant total du crédit autorisé et perçue trimestriellement et d'avance."
         else:
             replacements['[interets_non_speculatifs]'] = ''
             replacements['[commission_non_speculative]'] = ''
         
         # Gestion des clauses optionnelles
         # Clause 1: Garantie d'actif/passif
-        if self.clause_widgets[0].is_enabled():
+        if clauses[0]:
             replacements['[clause_garantie_actif_passif]'] = "Le cas échéant, production de la garantie d'actif/passif fournie par les vendeurs et examen favorable de LCL ; {cas rachat de parts de société}"
         else:
             replacements['[clause_garantie_actif_passif]'] = ''
         
         # Clause 2: Niveau de commercialisation lots
-        if self.clause_widgets[1].is_enabled():
-            replacements['[clause_niveau_commercialisation_lots]'] = f"Justification d'un niveau de commercialisation incluant au moins {values.get('nombre_t3', '')} lots de type T3 ainsi qu'au moins {values.get('nombre_t4', '')} lots de type T4 et {values.get('nombre_t5', '')} lots de type T5 (attestation du Notaire indiquant le niveau de pré commercialisation) ;"
+        if clauses[1]:
+            replacements['[clause_niveau_commercialisation_lots]'] = f"Justification d'un niveau de commercialisation incluant au moins {v['nombre_t3']} lots de type T3 ainsi qu'au moins {v['nombre_t4']} lots de type T4 et {v['nombre_t5']} lots de type T5 (attestation du Notaire indiquant le niveau de pré commercialisation) ;"
         else:
             replacements['[clause_niveau_commercialisation_lots]'] = ''
         
         # Clause 3: Accord de financement
-        if self.clause_widgets[2].is_enabled():
+        if clauses[2]:
             replacements['[clause_accord_financement]'] = "Justification de l'obtention d'un accord de principe de financement par la majorité des réservataires ;"
         else:
             replacements['[clause_accord_financement]'] = ''
         
         # Clause 4: Agrément bailleur
-        if self.clause_widgets[3].is_enabled():
-            replacements['[clause_agrement_bailleur]'] = f"Justification de l'obtention de l'agrément par {values.get('nom_bailleur_agrement', '')} pour la partie « {values.get('type_bloc', '')} » ;"
+        if clauses[3]:
+            replacements['[clause_agrement_bailleur]'] = f"Justification de l'obtention de l'agrément par {v['nom_bailleur_agrement']} pour la partie « {v['type_bloc']} » ;"
         else:
             replacements['[clause_agrement_bailleur]'] = ''
         
         # Clause 5: Engagement PC
-        if self.clause_widgets[4].is_enabled():
+        if clauses[4]:
             replacements['[clause_engagement_pc]'] = "Engagement de l'emprunteur d'informer la banque de toute demande de PC modificatif et ce jusqu'au remboursement complet des concours accordés ;"
         else:
             replacements['[clause_engagement_pc]'] = ''
         
         # Clause 6: Contrat de réservation
-        if self.clause_widgets[5].is_enabled():
-            replacements['[clause_contrat_reservation]'] = f"Justification d'un contrat de réservation signé de {values.get('nom_bailleur_reservation', '')} pour la partie « {values.get('type_bloc_reservation', '')} » comprenant nom, adresse, prix de vente TTC et échéancier des versements ;"
+        if clauses[5]:
+            replacements['[clause_contrat_reservation]'] = f"Justification d'un contrat de réservation signé de {v['nom_bailleur_reservation']} pour la partie « {v['type_bloc_reservation']} » comprenant nom, adresse, prix de vente TTC et échéancier des versements ;"
         else:
             replacements['[clause_contrat_reservation]'] = ''
 
         # Clause 7: Niveau de commercialisation libre
-        if len(self.clause_widgets) > 6 and self.clause_widgets[6].is_enabled():
-            niveau = values.get('niveau_commercialisation_libre', '')
+        if len(clauses) > 6 and clauses[6]:
+            niveau = v['niveau_commercialisation_libre']
             replacements['[clause_niveau_commercialisation_libre]'] = (
                 f"Justification d'un niveau de commercialisation du CATTC « libre » dépassant {niveau}% du CATTC « libre » (attestation notariée indiquant le niveau de pré commercialisation) ;"
                 if niveau else ''
             )
         else:
             replacements['[clause_niveau_commercialisation_libre]'] = ''
-
+        
+        return replacements
+    
+    def replace_in_paragraph(self, paragraph, replacements: Dict[str, str]):
+        """Remplace les variables dans un paragraphe en préservant le formatage"""
+        original_text = paragraph.text
+        
+        # La plupart des paragraphes ne contiennent aucune variable
+        if '[' not in original_text:
+            return
         
         # Effectuer les remplacements
-        new_text = original_text
-        for old_text, replacement in replacements.items():
-            if old_text in new_text:
-                new_text = new_text.replace(old_text, replacement)
+        new_text = self._PLACEHOLDER_RE.sub(lambda m: replacements[m.group(0)], original_text)
         
         # Mettre à jour le paragraphe si il y a eu des changements
         if new_text != original_text:
             # Conserver le formatage du premier run
             if paragraph.runs:
-                # Sauvegarder le style du premier run
-                first_run = paragraph.runs[0]
-                font_name = first_run.font.name
-                font_size = first_run.font.size
-                font_bold = first_run.font.bold
-                font_italic = first_run.font.italic
+                # Sauvegarder les propriétés (<w:rPr>) du premier run
+                rPr = paragraph.runs[0]._element.rPr
                 
                 # Effacer le contenu et ajouter le nouveau texte
                 paragraph.clear()
                 new_run = paragraph.add_run(new_text)
                 
-                # Restaurer le formatage
-                if font_name:
-                    new_run.font.name = font_name
-                if font_size:
-                    new_run.font.size = font_size
-                if font_bold:
-                    new_run.font.bold = font_bold
-                if font_italic:
-                    new_run.font.italic = font_italic
+                # Restaurer tout le formatage (couleur, soulignement, style...)
+                if rPr is not None:
+                    new_run._element.insert(0, deepcopy(rPr))
             else:
                 paragraph.text = new_text
     
-    def process_optional_clauses(self, doc: Document):
+    def process_optional_clauses(self, doc: "Document"):
         """Traite les clauses optionnelles - plus besoin de supprimer, tout est géré dans replace_in_paragraph"""
         # Cette méthode n'est plus nécessaire car tout est géré dans replace_in_paragraph
         # mais on la garde pour compatibilité
         pass
     
-    def remove_speculative_conditions(self, doc: Document):
+    def remove_speculative_conditions(self, doc: "Document"):
         """Supprime les conditions spéculatives du document"""
-        speculative_patterns = [
-            r'Intérêts portant sur les sommes utilisées.*?majoré de.*?fonds.*?;',
-            r'0,75%.*?l\'an.*?calculée sur le montant total du crédit autorisé.*?d\'avance.*?;'
-        ]
-        
-        for pattern in speculative_patterns:
+        for pattern in _SPECULATIVE_RES:
             self.remove_clause_from_document(doc, pattern)
     
-    def remove_non_speculative_conditions(self, doc: Document):
+    def remove_non_speculative_conditions(self, doc: "Document"):
         """Supprime les conditions non spéculatives du document"""
-        non_speculative_patterns = [
-            r'Lorsque le montant du CA TTC des VEFA actées atteindra 40%.*?fonds\.',
-            r'Lorsque le montant du CA TTC des VEFA actées atteindra 40%.*?d\'avance\.'
-        ]
-        
-        for pattern in non_speculative_patterns:
+        for pattern in _NON_SPECULATIVE_RES:
             self.remove_clause_from_document(doc, pattern)
     
-    def remove_clause_from_document(self, doc: Document, pattern: str):
+    def remove_clause_from_document(self, doc: "Document", pattern: re.Pattern):
         """Supprime une clause du document"""
         paragraphs_to_remove = []
         
         # Rechercher dans tous les paragraphes
         for paragraph in doc.paragraphs:
-            if re.search(pattern, paragraph.text, re.IGNORECASE | re.DOTALL):
+            if pattern.search(paragraph.text):
                 paragraphs_to_remove.append(paragraph)
         
         # Rechercher dans les tableaux
@@ -1109,7 +1365,7 @@ class TermsheetGenerator(QMainWindow):
                 for cell in row.cells:
                     cell_paragraphs_to_remove = []
                     for paragraph in cell.paragraphs:
-                        if re.search(pattern, paragraph.text, re.IGNORECASE | re.DOTALL):
+                        if pattern.search(paragraph.text):
                             cell_paragraphs_to_remove.append(paragraph)
                     
                     # Supprimer les paragraphes des cellules
@@ -1145,10 +1401,8 @@ class TermsheetGenerator(QMainWindow):
 
 def main():
     """Fonction principale"""
-    # Vérifier que les dépendances sont installées
-    try:
-        import docx
-    except ImportError:
+    # Vérifier que les dépendances sont installées (sans importer python-docx)
+    if importlib.util.find_spec("docx") is None:
         print("ERREUR: Le module python-docx n'est pas installé.")
         print("Veuillez l'installer avec la commande :")
         print("pip install python-docx")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fichier des profils promoteurs partagé par les générateurs de termsheet
+Lecture/écriture de profils.json et reprise/export au format Excel
+"""
+
+import os
+import json
+from pathlib import Path
+from typing import Dict, List
+
+
+# Colonnes du fichier Excel des profils (export et reprise de l'ancien format)
+PROFILE_COLUMNS = {
+    'nom_promoteur': 'Nom du promoteur',
+    'nom_contact': 'Nom du contact',
+    'adresse_promoteur': 'Adresse du promoteur',
+    'civilite': 'Civilité',
+}
+
+
+def read_profiles(profiles_path: Path, legacy_path: Path) -> List[Dict[str, str]]:
+    """Lit les profils du fichier JSON, ou les reprend une seule fois de l'ancien fichier Excel"""
+    # Toute erreur remonte à l'appelant : ne jamais repartir d'une liste vide,
+    # la sauvegarde suivante écraserait les profils existants
+    if profiles_path.exists():
+        with open(profiles_path, encoding='utf-8') as f:
+            profiles = json.load(f)
+        if not isinstance(profiles, list) or not all(isinstance(p, dict) for p in profiles):
+            raise ValueError(f"{profiles_path} ne contient pas une liste de profils")
+        return profiles
+
+    profiles = read_profiles_xlsx(legacy_path)
+    write_profiles(profiles_path, profiles)
+    return profiles
+
+
+def write_profiles(profiles_path: Path, profiles: List[Dict[str, str]]):
+    """Écrit la liste des profils dans le fichier JSON"""
+    # Écriture dans un fichier temporaire puis remplacement atomique :
+    # une coupure pendant la sauvegarde ne peut pas corrompre profils.json
+    tmp_path = profiles_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, profiles_path)
+
+
+def read_profiles_xlsx(path: Path) -> List[Dict[str, str]]:
+    """Lit les profils d'un fichier Excel (ancien format)"""
+    import pandas as pd
+
+    df = pd.read_excel(path, dtype=str).fillna('')
+    columns = {label: key for key, label in PROFILE_COLUMNS.items()}
+    if not all(col in df.columns for col in columns):
+        raise ValueError(f"Le fichier Excel {path} ne contient pas les bonnes colonnes")
+
+    records = df[list(columns)].rename(columns=columns).to_dict('records')
+    return [record for record in records if record['nom_promoteur']]
+
+
+def write_profiles_xlsx(path: str, profiles: List[Dict[str, str]]):
+    """Exporte les profils vers un fichier Excel"""
+    import pandas as pd
+
+    df = pd.DataFrame(profiles, columns=list(PROFILE_COLUMNS))
+    df = df.rename(columns=PROFILE_COLUMNS)
+    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
+        df.to_excel(writer, index=False)